@@ -0,0 +1,136 @@
+"""
+Streaming per-machine sensor anomaly baseline
+
+Each machine keeps a running mean and covariance of its raw channels,
+updated with Welford's recurrence. The update switches to an exponential
+window once `window` samples have been seen, so the baseline can follow slow
+drift. New readings are scored by Mahalanobis distance before they are
+folded in. This catches readings that are unusual for *that* machine even
+when the classifier has never seen the pattern in AI4I.
+
+State is a fixed (d, d) matrix per machine however long the stream runs, and
+every update is a few batched numpy operations across the fleet.
+"""
+import numpy as np
+from scipy.stats import chi2
+
+
+ANOMALY_CHANNELS = [
+    "Air_temperature_(K)",
+    "Process_temperature_(K)",
+    "Rotational_speed_(rpm)",
+    "Torque_(Nm)",
+    "Temp_delta",
+    "Power_est",
+]
+
+# Tail probability for the chi-square threshold on the squared distance
+DEFAULT_ALPHA = 1e-3
+
+
+class SensorBaseline:
+    """
+    Fleet-wide Welford mean/covariance with Mahalanobis anomaly scores
+
+    Parameters:
+    - n_machines: Number of machines tracked
+    - n_channels: Sensor channels per reading
+    - warmup: Samples a machine needs before it can be flagged
+    - window: Effective memory in samples once warm (exact Welford before that)
+    - alpha: False-alarm rate of the chi-square threshold under a Gaussian baseline
+    - ridge: Added to the correlation diagonal, so collinear channels
+      (Temp_delta is process minus air temperature) stay invertible
+    """
+
+    def __init__(self, n_machines, n_channels=len(ANOMALY_CHANNELS), warmup=30, window=500,
+                 alpha=DEFAULT_ALPHA, ridge=1e-3):
+        self.n_machines = int(n_machines)
+        self.n_channels = int(n_channels)
+        self.warmup = warmup
+        self.window = window
+        self.ridge = ridge
+        self.threshold = float(chi2.ppf(1.0 - alpha, self.n_channels))
+
+        self.mean = np.zeros((self.n_machines, self.n_channels))
+        self.cov = np.zeros((self.n_machines, self.n_channels, self.n_channels))
+        self.n_obs = np.zeros(self.n_machines, dtype=np.int64)
+
+    def reset(self, machines=None):
+        """Forget the history of the given machines (all if None)"""
+        idx = slice(None) if machines is None else machines
+        self.mean[idx] = 0.0
+        self.cov[idx] = 0.0
+        self.n_obs[idx] = 0
+
+    def _index(self, machines):
+        # A slice keeps whole-fleet updates on views instead of fancy-index copies
+        return slice(None) if machines is None else np.asarray(machines)
+
+    def _distance(self, x, idx):
+        """Squared Mahalanobis distance, z-scores and raw deviation from the baseline"""
+        delta = x - self.mean[idx]
+        cov = self.cov[idx]
+        inv_scale = 1.0 / np.sqrt(np.maximum(np.diagonal(cov, axis1=1, axis2=2), 1e-12))
+        z = delta * inv_scale
+
+        # Solve in correlation space so K, rpm, Nm and W channels share one scale
+        corr = cov * inv_scale[:, :, None] * inv_scale[:, None, :]
+        corr += self.ridge * np.eye(self.n_channels)
+        d2 = np.einsum("ij,ij->i", z, np.linalg.solve(corr, z[:, :, None])[:, :, 0])
+        return d2, z, delta
+
+    def score(self, x, machines=None):
+        """
+        Anomaly scores of new readings against each machine's baseline, without updating
+
+        Parameters:
+        - x: Readings, shape (k, n_channels), one row per machine in `machines`
+        - machines: Index array of machines observed (None = all, in order)
+
+        Returns:
+        - Tuple of (d2, z): squared Mahalanobis distance per row, and per-channel
+          z-scores of shape (k, n_channels) to tell which channels moved
+        """
+        d2, z, _ = self._distance(np.asarray(x, dtype=np.float64), self._index(machines))
+        return d2, z
+
+    def update(self, x, machines=None):
+        """
+        Score one reading per machine, then fold it into the baseline
+
+        A flagged reading is shrunk onto the threshold boundary before the
+        update, so one outlier cannot drag the baseline towards itself. A
+        persistent shift is still absorbed over roughly `window` samples.
+
+        Parameters:
+        - x: Readings, shape (k, n_channels), one row per machine in `machines`
+        - machines: Index array of machines observed (None = all, in order)
+
+        Returns:
+        - Tuple of (anomaly, d2, z) where anomaly is a bool array (False during warmup)
+        """
+        idx = self._index(machines)
+        d2, z, delta = self._distance(np.asarray(x, dtype=np.float64), idx)
+        n = self.n_obs[idx]
+        warm = n >= self.warmup
+        anomaly = warm & (d2 > self.threshold)
+
+        shrink = np.where(anomaly, np.sqrt(self.threshold / np.maximum(d2, 1e-12)), 1.0)
+        delta *= shrink[:, None]
+
+        # Welford: w = 1/n gives the exact running mean and (population)
+        # covariance; capping n at `window` turns it into an exponential window
+        w = 1.0 / np.minimum(n + 1, self.window)
+        self.mean[idx] += w[:, None] * delta
+        outer = delta[:, :, None] * delta[:, None, :]
+        self.cov[idx] = (1.0 - w)[:, None, None] * (self.cov[idx] + w[:, None, None] * outer)
+        self.n_obs[idx] = n + 1
+
+        d2 = np.where(warm, d2, 0.0)
+        return anomaly, d2, z
+
+
+def top_channel(z_row, channels=ANOMALY_CHANNELS):
+    """Name and signed z-score of the channel furthest from its baseline"""
+    j = int(np.argmax(np.abs(z_row)))
+    return channels[j], float(z_row[j])
@@ -1,6 +1,5 @@
 import streamlit as st
 import numpy as np
-import joblib
 from openai import OpenAI
 import os
 import pandas as pd
@@ -10,7 +9,16 @@ import altair as alt
 
 # Import our custom modules
 from styles import get_custom_css
-from result_boxes import create_result_box, create_metric_cards, create_status_badge, create_report_box
+from result_boxes import create_result_box, create_metric_cards, create_mode_cards, create_status_badge, create_report_box
+from scoring import FAILURE_MODES, load_artifacts
+from groq_client import GROQ_BASE_URL, ResilientLLMClient
+from offline_report import build_offline_report, feature_contributions, load_bands
+from scenarios import LIVE_COLUMNS, SCENARIOS, simulate_run
+from rul_forecast import TOOL_WEAR_LIMIT, RULForecaster, format_eta
+from stats_cube import StatsCube, build_chat_context, load_cube
+from failure_modes import load_failure_mode_model
+from ingest_gateway import DEFAULT_STORE_PATH, read_store_tail
+from anomaly_baseline import ANOMALY_CHANNELS, SensorBaseline, top_channel
 
 load_dotenv()
 
@@ -28,25 +36,47 @@ st.markdown(get_custom_css(), unsafe_allow_html=True)
 
  
 # LOAD MODEL
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+@st.cache_resource
+def get_artifacts():
+    """Load the model once per process instead of on every rerun"""
+    load_bands()  # warm the local report engine's band table
+    load_cube()  # and RiskBot's statistics cube
+    return load_artifacts()
 
-xgb = joblib.load(os.path.join(BASE_DIR, "xgb_model.pkl"))
-scaler = joblib.load(os.path.join(BASE_DIR, "scaler.pkl"))
-feature_names = joblib.load(os.path.join(BASE_DIR, "feature_names.pkl"))
+
+xgb, scaler, feature_names = get_artifacts()
+
+
+@st.cache_resource
+def get_failure_mode_model():
+    """Multi-output failure-mode model, if failure_modes.py has been run"""
+    return load_failure_mode_model()
+
+
+mode_model = get_failure_mode_model()
 
 
 # GROQ CLIENT
  
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-if GROQ_API_KEY:
+
+@st.cache_resource
+def get_llm_client():
+    """One rate-limited, circuit-broken client shared by every session in this process"""
     client = OpenAI(
         api_key=GROQ_API_KEY,
-        base_url="https://api.groq.com/openai/v1",
+        base_url=os.getenv("GROQ_BASE_URL", GROQ_BASE_URL),
     )
+    return ResilientLLMClient(client)
+
+
+if GROQ_API_KEY:
+    llm = get_llm_client()
+
 
 def groq_maintenance_report(features_dict, prediction, prob):
-    """Generate AI maintenance report"""
+    """Generate AI maintenance report (None if the LLM is unavailable)"""
     prompt = f"""
     You are a senior predictive maintenance engineer.
 
@@ -64,14 +94,15 @@ def groq_maintenance_report(features_dict, prediction, prob):
     - Simple English, no markdown, under 120 words.
     """
 
-    response = client.responses.create(
-        model="openai/gpt-oss-20b",
-        input=prompt,
-    )
-    return response.output_text
+    return llm.complete(prompt, fallback=lambda _prompt: None)
 
  
  
+if GROQ_API_KEY:
+    with st.sidebar.expander("🔌 LLM Client Health"):
+        st.json(llm.stats())
+
+
 st.markdown('<h1 class="main-title">🔧 Predictive Maintenance Assistant</h1>', unsafe_allow_html=True)
 st.markdown('<p class="subtitle">AI-powered machine health monitoring and failure prediction</p>', unsafe_allow_html=True)
 
@@ -161,11 +192,39 @@ with tab1:
         predict_btn = st.button("🔍 Analyze Machine Health", use_container_width=True)
 
     if predict_btn:
-        # Make prediction
+        # Make prediction + instant local report
         with st.spinner("⚙️ Analyzing machine data..."):
-            prob = float(xgb.predict_proba(x_vec)[0, 1])
-            pred = int(prob >= 0.5)
-        
+            mode_probs = None
+            if mode_model is not None:
+                # Overall risk and every failure mode in one pass of the multi-output model
+                all_probs = mode_model.predict_all(x_vec)[0]
+                prob = float(all_probs[0])
+                pred = int(prob >= mode_model.threshold)
+                mode_probs = dict(zip(mode_model.mode_names, map(float, all_probs[1:])))
+            else:
+                prob = float(xgb.predict_proba(x_vec)[0, 1])
+                pred = int(prob >= 0.5)
+            # Explanations still come from the binary model's SHAP contributions
+            contributions = feature_contributions(xgb, x_vec, feature_names)
+            local_report = build_offline_report(input_dict, pred, prob, contributions)
+
+        st.session_state["analysis"] = {
+            "input": dict(input_dict),
+            "prob": prob,
+            "pred": pred,
+            "local_report": local_report,
+            "mode_probs": mode_probs,
+            "ai_report": None,
+            "ai_failed": False,
+        }
+
+    # Keep showing the last analysis across reruns while the inputs are unchanged
+    analysis = st.session_state.get("analysis")
+    if analysis is not None and analysis["input"] == input_dict:
+        prob = analysis["prob"]
+        pred = analysis["pred"]
+        local_report = analysis["local_report"]
+
         st.markdown('<div class="section-header">📊 Analysis Results</div>', unsafe_allow_html=True)
         
         # Beautiful result boxes
@@ -178,6 +237,15 @@ with tab1:
             st.markdown(card2, unsafe_allow_html=True)
         with col3:
             st.markdown(card3, unsafe_allow_html=True)
+
+        if analysis["mode_probs"]:
+            st.markdown("**🧩 Failure Mode Breakdown**")
+            mode_cols = st.columns(len(analysis["mode_probs"]))
+            for col, card in zip(mode_cols, create_mode_cards(analysis["mode_probs"])):
+                with col:
+                    st.markdown(card, unsafe_allow_html=True)
+            top_mode = max(analysis["mode_probs"], key=analysis["mode_probs"].get)
+            st.caption(f"Most likely failure mode: {FAILURE_MODES[top_mode]} ({top_mode})")
         
         # Additional metrics in beautiful boxes
         st.markdown("---")
@@ -200,16 +268,36 @@ with tab1:
             )
             st.markdown(power_box, unsafe_allow_html=True)
         
-        # AI Report in beautiful box
+        # Local report is instant; the LLM is only called on request or low confidence
+        st.markdown('<div class="section-header">📋 Maintenance Recommendations</div>', unsafe_allow_html=True)
+        st.markdown(create_report_box(local_report["text"]), unsafe_allow_html=True)
+        st.caption(f"Local rule engine · confidence {local_report['confidence']*100:.0f}%")
+
         if GROQ_API_KEY:
-            st.markdown('<div class="section-header">🤖 AI Maintenance Recommendations</div>', unsafe_allow_html=True)
-            with st.spinner("🤖 Generating personalized report..."):
-                report = groq_maintenance_report(input_dict, pred, prob)
-            
-            report_box = create_report_box(report)
-            st.markdown(report_box, unsafe_allow_html=True)
+            # A failed automatic request is not repeated on every rerun; the button retries it
+            want_ai = local_report["low_confidence"] and not analysis["ai_failed"]
+            if analysis["ai_report"] is None and not want_ai:
+                col_ai1, col_ai2, col_ai3 = st.columns([1, 2, 1])
+                with col_ai2:
+                    want_ai = st.button("✨ Enhance with AI", use_container_width=True)
+
+            if want_ai and analysis["ai_report"] is None:
+                with st.spinner("🤖 Generating personalized report..."):
+                    analysis["ai_report"] = groq_maintenance_report(input_dict, pred, prob)
+                analysis["ai_failed"] = analysis["ai_report"] is None
+
+            if analysis["ai_failed"]:
+                st.warning(
+                    "⚠️ AI recommendations are temporarily unavailable. "
+                    "The local report above still applies; try again in a minute."
+                )
+
+            if analysis["ai_report"] is not None:
+                st.markdown('<div class="section-header">🤖 AI Maintenance Recommendations</div>', unsafe_allow_html=True)
+                report_box = create_report_box(analysis["ai_report"])
+                st.markdown(report_box, unsafe_allow_html=True)
         else:
-            st.warning("⚙️ Set GROQ_API_KEY to enable AI recommendations.")
+            st.caption("⚙️ Set GROQ_API_KEY to enable AI-enhanced recommendations.")
 
 
 # TAB 2: Chatbot
@@ -246,12 +334,19 @@ with tab2:
         elif not user_question.strip():
             st.warning("📝 Please enter a question first.")
         else:
+            data_stats = build_chat_context(
+                user_question, history_cube=st.session_state.get("history_cube")
+            )
             context = f"""
             We built a predictive maintenance model using features:
             {feature_names}
 
             XGBoost model with ~82% recall and ~99% accuracy.
             Key features: torque, speed, tool wear, temperature delta, power.
+
+            Statistics from the training data and live monitoring history
+            (quote these numbers when they answer the question):
+            {data_stats}
             """
             prompt = f"""
             You are a predictive maintenance expert.
@@ -263,12 +358,14 @@ with tab2:
             Answer in 2–4 short paragraphs, simple language, practical advice.
             """
 
+            # If the LLM is unavailable, answer with the grounded statistics alone
+            fallback_answer = (
+                "⚠️ RiskBot's AI answers are temporarily unavailable, so here are the "
+                "statistics relevant to your question. Please retry in a minute.<br><br>"
+                + "<br>".join(data_stats.splitlines())
+            )
             with st.spinner("🤔 RiskBot is thinking..."):
-                response = client.responses.create(
-                    model="openai/gpt-oss-20b",
-                    input=prompt,
-                )
-                answer = response.output_text
+                answer = llm.complete(prompt, fallback=lambda _prompt: fallback_answer)
 
             st.markdown('<div class="section-header">💡 Expert Response</div>', unsafe_allow_html=True)
             report_box = create_report_box(answer)
@@ -287,13 +384,7 @@ with tab3:
 
  
     if "live_data" not in st.session_state:
-        st.session_state["live_data"] = pd.DataFrame(
-            columns=[
-                "time", "Air_temperature_(K)", "Process_temperature_(K)",
-                "Rotational_speed_(rpm)", "Torque_(Nm)", "Tool_wear_(min)",
-                "Temp_delta", "Power_est", "failure_prob",
-            ]
-        )
+        st.session_state["live_data"] = pd.DataFrame(columns=LIVE_COLUMNS, dtype=float)
     if "events" not in st.session_state:
         st.session_state["events"] = []  
     if "sim_load" not in st.session_state:
@@ -302,17 +393,33 @@ with tab3:
         st.session_state["sim_wear"] = 50.0
     if "sim_running" not in st.session_state:
         st.session_state["sim_running"] = False
+    if "rul_forecaster" not in st.session_state:
+        st.session_state["rul_forecaster"] = RULForecaster(n_machines=1)
+    if "history_cube" not in st.session_state:
+        st.session_state["history_cube"] = StatsCube(targets=("failure_prob",))
+    if "anomaly_baseline" not in st.session_state:
+        st.session_state["anomaly_baseline"] = SensorBaseline(n_machines=1)
 
     risk_threshold = 0.6
     critical_threshold = 0.8
 
     #  CONFIG CONTROLS 
     st.markdown("**⚙️ Simulation Configuration**")
-    scenario = st.selectbox(
-        "Load Scenario",
-        ["Normal operation", "Increasing load", "High stress", "Random fluctuation"],
-        help="Preset patterns for simulated machine load behavior"
-    )
+    col_scenario, col_seed = st.columns([3, 1])
+    with col_scenario:
+        scenario = st.selectbox(
+            "Load Scenario",
+            list(SCENARIOS),
+            help="Preset patterns for simulated machine load behavior"
+        )
+    with col_seed:
+        sim_seed = st.number_input(
+            "Random seed",
+            min_value=0,
+            value=42,
+            step=1,
+            help="Same seed and history length reproduce the same run; each Start continues with new noise"
+        )
 
     col_controls = st.columns(3)
     with col_controls[0]:
@@ -339,6 +446,9 @@ with tab3:
             st.session_state["events"] = []
             st.session_state["sim_load"] = 0.3
             st.session_state["sim_wear"] = 50.0
+            st.session_state["rul_forecaster"].reset()
+            st.session_state["anomaly_baseline"].reset()
+            st.session_state["history_cube"] = StatsCube(targets=("failure_prob",))
             st.rerun()
 
     def start_sim():
@@ -393,6 +503,9 @@ with tab3:
         st.markdown("**📌 Current Status**")
         status_placeholder = st.empty()
 
+        st.markdown("**🔮 Time to Threshold**")
+        forecast_placeholder = st.empty()
+
         st.markdown("**📊 Session Summary**")
         summary_placeholder = st.empty()
 
@@ -415,80 +528,39 @@ with tab3:
 
     #  SIMULATION LOOP 
     if st.session_state["sim_running"]:
+        # Whole run is generated from the seed and scored in one batch up front;
+        # the loop below only animates the precomputed result. Mixing in the
+        # history length gives each Start its own noise while a cleared history
+        # replays the same sequence of runs.
+        history = st.session_state["live_data"]
+        run_df = simulate_run(
+            xgb,
+            feature_names,
+            scenario,
+            int(n_steps),
+            seed=(int(sim_seed), len(history)),
+            start_load=st.session_state["sim_load"],
+            start_wear=st.session_state["sim_wear"],
+            start_time=len(history) + 1,
+        )
+
         for step_idx in range(int(n_steps)):
             
             if not st.session_state["sim_running"]:
                 break
 
-            
-            load = st.session_state["sim_load"]
-
-            if scenario == "Normal operation":
-                load += np.random.normal(loc=0.0, scale=0.03)
-            elif scenario == "Increasing load":
-                load += 0.01 + np.random.normal(0.0, 0.02)
-            elif scenario == "Under High stress":
-                load = np.random.uniform(0.7, 1.0)
-            else:  
-                load = np.random.uniform(0.0, 1.0)
-
-            load = float(np.clip(load, 0.0, 1.0))
-            st.session_state["sim_load"] = load
-
-            wear = st.session_state["sim_wear"] + np.random.uniform(0.2, 0.8)
-            wear = float(np.clip(wear, 0.0, 300.0))
-            st.session_state["sim_wear"] = wear
-
-            # Base operating points
-            base_air = 295.0
-            base_speed = 1200.0
-            base_torque = 30.0
-
-            # Simulated sensors (correlated with load)
-            air_temp = np.random.normal(loc=base_air, scale=1.5)
-            process_temp = air_temp + 5 + 20 * load + np.random.normal(0, 0.7)
-            rotational_speed = base_speed + 1000 * load + np.random.normal(0, 80)
-            torque = base_torque + 45 * load + np.random.normal(0, 5)
-            tool_wear = wear
-
-            temp_delta = process_temp - air_temp
-            power_est = torque * rotational_speed
-
-            feat_dict = {
-                "Air_temperature_(K)": air_temp,
-                "Process_temperature_(K)": process_temp,
-                "Rotational_speed_(rpm)": rotational_speed,
-                "Torque_(Nm)": torque,
-                "Tool_wear_(min)": tool_wear,
-                "Temp_delta": temp_delta,
-                "Power_est": power_est,
-                "Type_L": 0.0,
-                "Type_M": 0.0,
-            }
-
-            #   2. Model prediction  
-            x_vec_live = [float(feat_dict.get(fname, 0.0)) for fname in feature_names]
-            x_vec_live = np.array(x_vec_live).reshape(1, -1)
-            prob_live = float(xgb.predict_proba(x_vec_live)[0, 1])
-
-            #   3. Append row to live_data  
-            new_row = {
-                "time": len(st.session_state["live_data"]) + 1,
-                "Air_temperature_(K)": air_temp,
-                "Process_temperature_(K)": process_temp,
-                "Rotational_speed_(rpm)": rotational_speed,
-                "Torque_(Nm)": torque,
-                "Tool_wear_(min)": tool_wear,
-                "Temp_delta": temp_delta,
-                "Power_est": power_est,
-                "failure_prob": prob_live,
-            }
+            step = run_df.iloc[step_idx]
+            prob_live = float(step["failure_prob"])
+            st.session_state["sim_load"] = float(step["load"])
+            st.session_state["sim_wear"] = float(step["Tool_wear_(min)"])
+
             st.session_state["live_data"] = pd.concat(
-                [st.session_state["live_data"], pd.DataFrame([new_row])],
+                [history, run_df.iloc[: step_idx + 1][LIVE_COLUMNS]],
                 ignore_index=True,
             )
+            st.session_state["history_cube"].add(run_df.iloc[[step_idx]])
+
 
-           
             df_plot = st.session_state["live_data"].copy()
             df_plot = df_plot.set_index("time")
             df_last = df_plot.tail(100)
@@ -575,7 +647,22 @@ with tab3:
                     f"✅ OK: Failure probability {prob_live*100:.1f}% (step {len(df_plot)})"
                 )
 
-            #   6. Event logging (high risk + spikes)  
+            #   5b. Online trend forecast (O(1) per step)
+            forecaster = st.session_state["rul_forecaster"]
+            forecaster.update([float(step["Tool_wear_(min)"])], [prob_live])
+            forecast = forecaster.forecast(risk_threshold, critical_threshold)
+            forecast_placeholder.markdown(
+                f"- Risk ≥ {risk_threshold:.0%}: {format_eta(*(a[0] for a in forecast['risk']))}\n"
+                f"- Critical ≥ {critical_threshold:.0%}: {format_eta(*(a[0] for a in forecast['critical']))}\n"
+                f"- Tool wear {TOOL_WEAR_LIMIT:.0f} min: {format_eta(*(a[0] for a in forecast['tool_wear']))}"
+            )
+
+            #   5c. Per-machine sensor baseline (catches drift the classifier has not learned)
+            anomaly, _, z_scores = st.session_state["anomaly_baseline"].update(
+                step[ANOMALY_CHANNELS].to_numpy(dtype=float)[None, :]
+            )
+
+            #   6. Event logging (high risk + spikes + sensor anomalies)  
             if prob_live >= risk_threshold:
                 st.session_state["events"].append(
                     {
@@ -597,6 +684,16 @@ with tab3:
                         }
                     )
 
+            if anomaly[0]:
+                channel, z_score = top_channel(z_scores[0])
+                st.session_state["events"].append(
+                    {
+                        "time": int(df_plot.index[-1]),
+                        "failure_prob": prob_live,
+                        "type": f"Sensor anomaly 🔍 ({channel} {z_score:+.1f}σ)",
+                    }
+                )
+
             if st.session_state["events"]:
                 events_df = pd.DataFrame(st.session_state["events"])
                 events_df["Risk %"] = (events_df["failure_prob"] * 100).round(1)
@@ -629,4 +726,28 @@ with tab3:
 
         # After loop, stop monitoring so user can start again
         st.session_state["sim_running"] = False
-        progress_bar.empty()
\ No newline at end of file
+        progress_bar.empty()
+
+    #  GATEWAY FEED (readings scored by ingest_gateway.py)
+    if os.path.exists(DEFAULT_STORE_PATH):
+        st.markdown("---")
+        st.markdown('<div class="section-header">📥 Gateway Feed</div>', unsafe_allow_html=True)
+        feed = read_store_tail(DEFAULT_STORE_PATH)
+        if len(feed) == 0:
+            st.info("The ingestion gateway has not published any readings yet.")
+        else:
+            latest = feed.groupby("machine_id", sort=False).tail(1)
+            latest = latest.sort_values("failure_prob", ascending=False)
+            col_feed1, col_feed2, col_feed3 = st.columns(3)
+            with col_feed1:
+                st.metric("Machines Reporting", latest["machine_id"].nunique())
+            with col_feed2:
+                st.metric("High-Risk Machines", int((latest["failure_prob"] >= risk_threshold).sum()))
+            with col_feed3:
+                st.metric("Recent Readings", len(feed))
+
+            feed_view = latest[["machine_id", "Torque_(Nm)", "Rotational_speed_(rpm)", "Tool_wear_(min)"]].copy()
+            feed_view["Risk %"] = (latest["failure_prob"] * 100).round(1)
+            feed_view["Last seen"] = pd.to_datetime(latest["time"], unit="s").dt.strftime("%H:%M:%S")
+            st.dataframe(feed_view.head(20), use_container_width=True, hide_index=True)
+            st.button("🔄 Refresh Feed", key="refresh_feed")
@@ -0,0 +1,182 @@
+import argparse
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import pandas as pd
+
+from scoring import FEATURE_NAMES_PATH, MODEL_PATH, predict_failure_modes, predict_failure_proba
+
+
+DEFAULT_SHARD_MB = 8
+
+# Model state owned by each worker process (loaded once in _init_worker)
+_worker_model = None
+_worker_feature_names = None
+
+
+def plan_shards(path, shard_bytes):
+    """
+    Split a CSV file into line-aligned byte ranges
+
+    Parameters:
+    - path: Input CSV path (first line is the header)
+    - shard_bytes: Target size of each shard in bytes
+
+    Returns:
+    - Tuple of (column_names, list of (start, end) byte offsets)
+    """
+    size = os.path.getsize(path)
+    shards = []
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        start = fh.tell()
+        while start < size:
+            fh.seek(min(start + shard_bytes, size))
+            if fh.tell() < size:
+                fh.readline()
+            end = fh.tell()
+            shards.append((start, end))
+            start = end
+
+    columns = header.decode("utf-8-sig").rstrip("\r\n").split(",")
+    return columns, shards
+
+
+def _init_worker(model_path, feature_names_path):
+    """Load the model once per worker process, single-threaded to avoid oversubscription"""
+    global _worker_model, _worker_feature_names
+    _worker_model = joblib.load(model_path)
+    _worker_model.set_params(n_jobs=1)
+    _worker_feature_names = joblib.load(feature_names_path)
+
+
+def _score_shard(path, start, end, columns, threshold):
+    """Read one byte range of the input, score it and return the output CSV text"""
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        raw = fh.read(end - start)
+
+    chunk = pd.read_csv(io.BytesIO(raw), header=None, names=columns)
+    mode_names = getattr(_worker_model, "mode_names", ())
+    if mode_names:
+        # Multi-output model: overall risk and every failure mode in one pass
+        probs = predict_failure_modes(_worker_model, chunk, _worker_feature_names)
+        prob = probs[:, 0]
+    else:
+        prob = predict_failure_proba(_worker_model, chunk, _worker_feature_names)
+    chunk["failure_prob"] = prob
+    chunk["failure_pred"] = (prob >= threshold).astype(int)
+    for j, mode in enumerate(mode_names, start=1):
+        chunk[f"{mode}_prob"] = probs[:, j]
+    return chunk.to_csv(index=False, header=False, float_format="%.6g"), len(chunk)
+
+
+def score_file(
+    input_path,
+    output_path,
+    workers=1,
+    shard_mb=DEFAULT_SHARD_MB,
+    threshold=0.5,
+    model_path=MODEL_PATH,
+    feature_names_path=FEATURE_NAMES_PATH,
+):
+    """
+    Score a large CSV of sensor readings, optionally across several processes
+
+    Each worker loads the model once and scores whole shards. Results are
+    written in input order, and at most 2 shards per worker are in flight so
+    memory stays bounded regardless of file size.
+
+    Parameters:
+    - input_path: CSV in the AI4I layout (raw or cleaned column names)
+    - output_path: Destination CSV (input columns + failure_prob + failure_pred,
+      plus <mode>_prob per failure mode when the model is multi-output)
+    - workers: Number of scoring processes (1 = score in this process)
+    - shard_mb: Target shard size in megabytes
+    - threshold: Probability cut-off for failure_pred
+    - model_path: Pickled classifier to load in each worker
+    - feature_names_path: Pickled feature order for the model
+
+    Returns:
+    - Dict with rows, shards, workers and elapsed seconds
+    """
+    columns, shards = plan_shards(input_path, int(shard_mb * 1024 * 1024))
+    mode_names = getattr(joblib.load(model_path), "mode_names", ())
+    out_columns = columns + ["failure_prob", "failure_pred"] + [f"{mode}_prob" for mode in mode_names]
+
+    t0 = time.perf_counter()
+    n_rows = 0
+
+    with open(output_path, "w", newline="") as out:
+        out.write(",".join(out_columns) + "\n")
+
+        if workers <= 1:
+            _init_worker(model_path, feature_names_path)
+            for start, end in shards:
+                text, rows = _score_shard(input_path, start, end, columns, threshold)
+                out.write(text)
+                n_rows += rows
+        else:
+            max_in_flight = 2 * workers
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(model_path, feature_names_path),
+            ) as pool:
+                pending = deque()
+                for start, end in shards:
+                    if len(pending) >= max_in_flight:
+                        text, rows = pending.popleft().result()
+                        out.write(text)
+                        n_rows += rows
+                    pending.append(
+                        pool.submit(_score_shard, input_path, start, end, columns, threshold)
+                    )
+                while pending:
+                    text, rows = pending.popleft().result()
+                    out.write(text)
+                    n_rows += rows
+
+    return {
+        "rows": n_rows,
+        "shards": len(shards),
+        "workers": workers,
+        "elapsed_s": time.perf_counter() - t0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch failure-risk scoring for sensor logs")
+    parser.add_argument("input", help="Input CSV (AI4I layout)")
+    parser.add_argument("output", help="Output CSV path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-mb", type=float, default=DEFAULT_SHARD_MB)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument(
+        "--model",
+        default=MODEL_PATH,
+        help="Pickled model to score with (e.g. cascade.pkl or failure_modes.pkl)",
+    )
+    args = parser.parse_args()
+
+    stats = score_file(
+        args.input,
+        args.output,
+        workers=args.workers,
+        shard_mb=args.shard_mb,
+        threshold=args.threshold,
+        model_path=args.model,
+    )
+    rate = stats["rows"] / stats["elapsed_s"] if stats["elapsed_s"] > 0 else 0.0
+    print(
+        f"Scored {stats['rows']} rows in {stats['shards']} shards with "
+        f"{stats['workers']} worker(s): {stats['elapsed_s']:.2f}s ({rate:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
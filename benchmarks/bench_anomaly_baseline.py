@@ -0,0 +1,148 @@
+"""
+Throughput and detection benchmark for anomaly_baseline.SensorBaseline
+
+Throughput: one reading per machine per tick for a whole fleet, timing
+update (score + Welford fold) per tick.
+
+Detection: machines run around operating points drawn from AI4I rows. From
+a fault tick onwards, a fraction of them ramp into an overload, cooling or
+drive fault. The tick each fault is first flagged by the baseline is
+compared with the tick the XGBoost classifier first crosses 0.5 on the same
+readings, and false alarms are counted on healthy machines.
+
+    python benchmarks/bench_anomaly_baseline.py --machines 1000 10000 100000 --ticks 100
+    python benchmarks/bench_anomaly_baseline.py --detect --fleet 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anomaly_baseline import SensorBaseline  # noqa: E402
+from scoring import load_artifacts, load_training_data  # noqa: E402
+
+
+# Fault name -> change at the end of the ramp (air K, process K, speed rpm, torque Nm)
+FAULTS = {
+    "overload": (0.0, 0.0, -150.0, 25.0),
+    "cooling": (0.0, -4.0, -100.0, 0.0),
+    "drive": (0.0, 0.0, -300.0, 10.0),
+}
+
+
+def readings(air, process, speed, torque):
+    """Stack the raw channels plus the derived ones in ANOMALY_CHANNELS order"""
+    return np.column_stack([air, process, speed, torque, process - air, torque * speed])
+
+
+def bench_throughput(machine_counts, ticks, seed):
+    print(f"{'machines':>9} {'update ms/tick':>15} {'ns/machine':>11} {'state bytes/machine':>20}")
+    for n in machine_counts:
+        rng = np.random.default_rng(seed)
+        base = np.array([300.0, 310.0, 1500.0, 40.0])
+        noise = np.array([0.5, 0.3, 30.0, 1.5])
+
+        baseline = SensorBaseline(n)
+        update_s = 0.0
+        for _ in range(ticks):
+            raw = base + rng.normal(size=(n, 4)) * noise
+            x = readings(*raw.T)
+            t0 = time.perf_counter()
+            baseline.update(x)
+            update_s += time.perf_counter() - t0
+
+        state = baseline.mean.nbytes + baseline.cov.nbytes + baseline.n_obs.nbytes
+        ms_tick = update_s / ticks * 1000
+        print(f"{n:>9,} {ms_tick:>15.2f} {ms_tick * 1e6 / n:>11.0f} {state // n:>20}")
+
+
+def bench_detection(n, ticks, fault_tick, ramp, fault_fraction, seed):
+    xgb, _, feature_names = load_artifacts()
+    X, y, _ = load_training_data(feature_names=feature_names)
+    rng = np.random.default_rng(seed)
+
+    # Operating points: healthy AI4I rows with headroom on tool wear
+    healthy = X[(y == 0) & (X["Tool_wear_(min)"] < 150)].to_numpy()
+    points = healthy[rng.integers(0, len(healthy), n)]
+    col = {name: j for j, name in enumerate(feature_names)}
+    op = points[:, [col["Air_temperature_(K)"], col["Process_temperature_(K)"],
+                    col["Rotational_speed_(rpm)"], col["Torque_(Nm)"]]]
+
+    faulty = rng.random(n) < fault_fraction
+    kinds = rng.choice(list(FAULTS), n)
+    shift = np.array([FAULTS[k] for k in kinds]) * faulty[:, None]
+
+    baseline = SensorBaseline(n)
+    first_flag = np.full(n, -1)
+    first_risk = np.full(n, -1)
+    false_alarms = healthy_ticks = 0
+
+    for t in range(ticks):
+        progress = np.clip((t - fault_tick) / ramp, 0.0, 1.0)
+        speed_noise = rng.normal(0, 20, n)
+        raw = op + shift * progress
+        air = raw[:, 0] + rng.normal(0, 0.3, n)
+        process = raw[:, 1] + (air - raw[:, 0]) + rng.normal(0, 0.2, n)
+        speed = raw[:, 2] + speed_noise
+        torque = raw[:, 3] - 0.03 * speed_noise + rng.normal(0, 1.0, n)
+        x = readings(air, process, speed, torque)
+
+        anomaly, _, _ = baseline.update(x)
+
+        features = points.copy()
+        features[:, col["Air_temperature_(K)"]] = air
+        features[:, col["Process_temperature_(K)"]] = process
+        features[:, col["Rotational_speed_(rpm)"]] = speed
+        features[:, col["Torque_(Nm)"]] = torque
+        features[:, col["Tool_wear_(min)"]] += 0.2 * t
+        features[:, col["Temp_delta"]] = process - air
+        features[:, col["Power_est"]] = torque * speed
+        risky = xgb.predict_proba(features)[:, 1] >= 0.5
+
+        if t >= fault_tick:
+            first_flag = np.where((first_flag < 0) & anomaly, t, first_flag)
+            first_risk = np.where((first_risk < 0) & risky, t, first_risk)
+        if t >= baseline.warmup:
+            false_alarms += int((anomaly & ~faulty).sum())
+            healthy_ticks += int((~faulty).sum())
+
+    print(f"{n:,} machines, {faulty.sum()} faults ramping over {ramp} ticks from tick {fault_tick}")
+    print(f"False alarm rate on healthy machines: {false_alarms / max(healthy_ticks, 1):.2%} of readings")
+    print(f"{'fault':<9} {'count':>6} {'baseline caught':>16} {'classifier caught':>18} "
+          f"{'median delay (base/clf)':>24} {'baseline first':>15}")
+    for kind in FAULTS:
+        m = faulty & (kinds == kind)
+        flag, risk = first_flag[m], first_risk[m]
+        caught_b, caught_c = flag >= 0, risk >= 0
+        delay_b = np.median(flag[caught_b] - fault_tick) if caught_b.any() else np.nan
+        delay_c = np.median(risk[caught_c] - fault_tick) if caught_c.any() else np.nan
+        earlier = caught_b & (~caught_c | (flag < risk))
+        print(f"{kind:<9} {m.sum():>6} {caught_b.mean():>16.0%} {caught_c.mean():>18.0%} "
+              f"{delay_b:>11.0f} / {delay_c:<10.0f} {earlier.mean():>15.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--machines", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--detect", action="store_true", help="Run the fault-detection comparison")
+    parser.add_argument("--fleet", type=int, default=2000, help="Machines in the detection run")
+    parser.add_argument("--fault-tick", type=int, default=200)
+    parser.add_argument("--ramp", type=int, default=100)
+    parser.add_argument("--fault-fraction", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.detect:
+        bench_detection(args.fleet, args.fault_tick + 2 * args.ramp, args.fault_tick,
+                        args.ramp, args.fault_fraction, args.seed)
+    else:
+        bench_throughput(args.machines, args.ticks, args.seed)
+
+
+if __name__ == "__main__":
+    main()
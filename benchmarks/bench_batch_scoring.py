@@ -0,0 +1,72 @@
+"""
+Scaling benchmark for batch_scoring.score_file
+
+Builds a synthetic sensor log by resampling data/ai4i2020.csv with small
+Gaussian jitter, then scores it with 1..N worker processes.
+
+    python benchmarks/bench_batch_scoring.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_scoring import score_file  # noqa: E402
+from scoring import DATA_PATH, RAW_TO_MODEL_COLUMNS  # noqa: E402
+
+
+def make_synthetic_log(path, n_rows, chunk_rows=500_000, seed=0):
+    """Write n_rows of jittered AI4I rows to path in chunks"""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
+    sensor_cols = list(RAW_TO_MODEL_COLUMNS)
+    jitter_scale = base[sensor_cols].std().to_numpy() * 0.05
+
+    written = 0
+    with open(path, "w", newline="") as fh:
+        while written < n_rows:
+            n = min(chunk_rows, n_rows - written)
+            chunk = base.iloc[rng.integers(0, len(base), size=n)].reset_index(drop=True)
+            noise = rng.normal(0.0, 1.0, size=(n, len(sensor_cols))) * jitter_scale
+            chunk[sensor_cols] = chunk[sensor_cols].to_numpy() + noise
+            chunk["Tool wear [min]"] = chunk["Tool wear [min]"].clip(lower=0)
+            chunk["UDI"] = np.arange(written + 1, written + n + 1)
+            chunk.to_csv(fh, index=False, header=(written == 0), float_format="%.2f")
+            written += n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-mb", type=float, default=8)
+    parser.add_argument("--input", help="Reuse an existing synthetic file instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = args.input or os.path.join(tmp, "synthetic_sensor_log.csv")
+        if not args.input:
+            print(f"Generating {args.rows:,} rows -> {input_path}")
+            make_synthetic_log(input_path, args.rows)
+
+        output_path = os.path.join(tmp, "scored.csv")
+        print(f"{'workers':>7} {'rows':>12} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            stats = score_file(input_path, output_path, workers=workers, shard_mb=args.shard_mb)
+            if baseline is None:
+                baseline = stats["elapsed_s"]
+            rate = stats["rows"] / stats["elapsed_s"]
+            print(
+                f"{workers:>7} {stats['rows']:>12,} {stats['elapsed_s']:>9.2f} "
+                f"{rate:>12,.0f} {baseline / stats['elapsed_s']:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Load test for groq_client.ResilientLLMClient against the fault-injecting stub
+
+Fires concurrent prompts through the wrapper while the stub returns 429/5xx
+errors and slow answers, then prints the wrapper's counters and latencies.
+
+    python benchmarks/bench_groq_client.py --calls 60 --threads 16 --error-rate 0.3
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI  # noqa: E402
+
+from groq_client import DEGRADED_RESPONSE, ResilientLLMClient  # noqa: E402
+from llm_stub import StubLLMServer, random_faults  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rpm", type=float, default=600, help="Rate limit for the wrapper")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.3)
+    parser.add_argument("--slow-rate", type=float, default=0.1)
+    parser.add_argument("--slow-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    faults = random_faults(args.error_rate, slow_rate=args.slow_rate, slow_seconds=args.slow_seconds)
+    with StubLLMServer(latency=0.05, fault_fn=faults) as stub:
+        llm = ResilientLLMClient(
+            OpenAI(api_key="stub", base_url=stub.base_url),
+            requests_per_minute=args.rpm,
+            tokens_per_minute=None,
+            max_concurrency=args.concurrency,
+            timeout=args.timeout,
+            backoff_base=0.1,
+            backoff_max=1.0,
+            reset_timeout=2.0,
+        )
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            answers = list(pool.map(llm.complete, [f"status check {i}" for i in range(args.calls)]))
+        elapsed = time.perf_counter() - t0
+
+    degraded = sum(answer == DEGRADED_RESPONSE for answer in answers)
+    print(f"{args.calls} calls in {elapsed:.2f}s, {degraded} degraded, "
+          f"{stub.faults_injected} faults injected over {len(stub.requests)} upstream requests")
+    for key, value in llm.stats().items():
+        print(f"  {key:>17}: {value:.3f}" if isinstance(value, float) else f"  {key:>17}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Sustained throughput benchmark for ingest_gateway.IngestGateway
+
+Sender processes stream resampled AI4I snapshots as line-delimited JSON to a
+gateway on ephemeral ports as fast as they can. Messages/second is counted
+end to end, from first send to last scored row. The run is repeated for each
+queue policy so drops and backpressure can be compared.
+
+    python benchmarks/bench_ingest_gateway.py --messages 200000 --senders 2 --protocol tcp
+    python benchmarks/bench_ingest_gateway.py --protocol udp --rate 8000
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from ingest_gateway import POLICIES, IngestGateway, MonitoringStore  # noqa: E402
+from scoring import load_artifacts, load_training_data  # noqa: E402
+
+
+def make_payload(n, seed=0, lines_per_packet=1):
+    """Pre-encoded snapshot lines (grouped into packets), so senders only do I/O"""
+    X, _, df = load_training_data()
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(df), size=n)
+    sample = X.iloc[idx].to_numpy()
+    ids = df["Product ID"].to_numpy()[idx]
+    columns = list(X.columns)
+    lines = []
+    for i in range(n):
+        record = {c: round(float(v), 3) for c, v in zip(columns, sample[i])}
+        record["machine_id"] = str(ids[i])
+        lines.append(json.dumps(record).encode() + b"\n")
+    return [b"".join(lines[i:i + lines_per_packet]) for i in range(0, n, lines_per_packet)]
+
+
+def _send(protocol, port, packets, ready, packets_per_s):
+    """Send every packet, paced to `packets_per_s` (0 = as fast as possible)"""
+    ready.wait()
+    chunk = 256
+    t0 = time.perf_counter()
+    if protocol == "tcp":
+        sock = socket.create_connection(("127.0.0.1", port))
+        send = sock.sendall
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        send = lambda data: sock.sendto(data, ("127.0.0.1", port))  # noqa: E731
+    with sock:
+        for start in range(0, len(packets), chunk):
+            if protocol == "tcp":
+                send(b"".join(packets[start:start + chunk]))
+            else:
+                for packet in packets[start:start + chunk]:
+                    send(packet)
+            if packets_per_s:
+                ahead = (start + chunk) / packets_per_s - (time.perf_counter() - t0)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+
+async def run_policy(policy, protocol, packets_per_sender, model, feature_names, args):
+    store = MonitoringStore(path=None, max_rows=1000)
+    gateway = IngestGateway(
+        model,
+        feature_names,
+        interval=args.interval,
+        max_batch=args.max_batch,
+        queue_size=args.queue_size,
+        policy=policy,
+        sinks=[store.publish],
+    )
+    ports = await gateway.start(tcp_port=0 if protocol == "tcp" else None,
+                                udp_port=0 if protocol == "udp" else None)
+
+    ctx = mp.get_context("spawn")
+    ready = ctx.Event()
+    senders = [
+        ctx.Process(target=_send, args=(protocol, ports[protocol], packets, ready, args.packet_rate))
+        for packets in packets_per_sender
+    ]
+    for proc in senders:
+        proc.start()
+    await asyncio.sleep(1.0)  # let the spawned senders import
+
+    t0 = time.perf_counter()
+    ready.set()
+    while any(proc.is_alive() for proc in senders):
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.2)  # UDP datagrams still in the socket buffer
+    await gateway.flush()
+    elapsed = time.perf_counter() - t0
+    await gateway.stop()
+    return gateway.stats(), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--senders", type=int, default=2)
+    parser.add_argument("--protocol", choices=["tcp", "udp"], default="tcp")
+    parser.add_argument("--lines-per-packet", type=int, default=10, help="UDP only")
+    parser.add_argument("--rate", type=float, default=0, help="Messages/s per sender (0 = unthrottled)")
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=list(POLICIES))
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--max-batch", type=int, default=4096)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    model, _, feature_names = load_artifacts()
+    per_sender = args.messages // args.senders
+    lines_per_packet = args.lines_per_packet if args.protocol == "udp" else 1
+    args.packet_rate = args.rate / lines_per_packet
+    payloads = [make_payload(per_sender, seed=s, lines_per_packet=lines_per_packet)
+                for s in range(args.senders)]
+
+    print(f"{args.messages:,} {args.protocol.upper()} messages from {args.senders} sender(s), "
+          f"queue {args.queue_size:,}, batch <= {args.max_batch}, interval {args.interval}s")
+    print(f"{'policy':<12} {'received':>9} {'lost':>7} {'dropped':>9} {'scored':>9} {'batches':>8} "
+          f"{'batch ms':>9} {'elapsed s':>10} {'scored msg/s':>13}")
+    for policy in args.policies:
+        stats, elapsed = asyncio.run(
+            run_policy(policy, args.protocol, payloads, model, feature_names, args)
+        )
+        # Lost = never reached the gateway (UDP socket buffer overflow)
+        lost = per_sender * args.senders - stats["received"] - stats["malformed"]
+        print(f"{policy:<12} {stats['received']:>9,} {lost:>7,} {stats['dropped']:>9,} {stats['scored']:>9,} "
+              f"{stats['batches']:>8} {stats['mean_batch_ms']:>9.1f} {elapsed:>10.2f} "
+              f"{stats['scored'] / elapsed:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Throughput benchmark for rul_forecast.RULForecaster
+
+Feeds synthetic tool-wear and failure-probability streams for a whole fleet,
+one sample per machine per tick, and times update + forecast per tick.
+
+    python benchmarks/bench_rul_forecast.py --machines 1000 10000 100000 --ticks 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rul_forecast import RULForecaster  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--machines", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'machines':>9} {'update ms/tick':>15} {'forecast ms/tick':>17} {'ns/machine':>11} {'wear MAE steps':>15}")
+    for n in args.machines:
+        rng = np.random.default_rng(args.seed)
+        wear_rate = rng.uniform(0.2, 0.8, n)
+        risk_rate = rng.uniform(-0.002, 0.01, n)
+        wear = rng.uniform(0, 150, n)
+        risk = rng.uniform(0, 0.3, n)
+
+        forecaster = RULForecaster(n)
+        update_s = forecast_s = 0.0
+        for _ in range(args.ticks):
+            wear = wear + wear_rate
+            risk = np.clip(risk + risk_rate + rng.normal(0, 0.05, n), 0, 1)
+
+            t0 = time.perf_counter()
+            forecaster.update(wear, risk)
+            t1 = time.perf_counter()
+            result = forecaster.forecast(0.6, 0.8)
+            forecast_s += time.perf_counter() - t1
+            update_s += t1 - t0
+
+        # Known linear wear -> exact steps remaining to the limit
+        true_eta = np.maximum(200.0 - wear, 0) / wear_rate
+        eta = result["tool_wear"][0]
+        mae = float(np.mean(np.abs(eta[true_eta > 0] - true_eta[true_eta > 0])))
+
+        per_tick = (update_s + forecast_s) / args.ticks
+        print(f"{n:>9,} {update_s / args.ticks * 1e3:>15.3f} {forecast_s / args.ticks * 1e3:>17.3f} "
+              f"{per_tick / n * 1e9:>11.1f} {mae:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Headless benchmark of the live-monitor scenarios
+
+For every scenario, generates and batch-scores full runs from a range of
+seeds and compares the cost per step with scoring one row at a time (the
+previous per-step approach). Also prints per-scenario risk statistics.
+
+    python benchmarks/bench_scenarios.py --steps 300 --runs 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenarios import SCENARIOS, generate_trajectory, simulate_run  # noqa: E402
+from scoring import load_artifacts, to_matrix  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=20, help="Seeds per scenario")
+    args = parser.parse_args()
+
+    xgb, _, feature_names = load_artifacts()
+    xgb.predict_proba(np.zeros((1, len(feature_names))))  # warm-up
+
+    print(f"{'scenario':<20} {'batch us/step':>14} {'per-row us/step':>16} "
+          f"{'mean risk':>10} {'max risk':>9} {'steps>=0.6':>11}")
+    for scenario in SCENARIOS:
+        t0 = time.perf_counter()
+        runs = [simulate_run(xgb, feature_names, scenario, args.steps, seed=s) for s in range(args.runs)]
+        batch_us = (time.perf_counter() - t0) / (args.runs * args.steps) * 1e6
+
+        # Same trajectory scored one row per step
+        x = to_matrix(generate_trajectory(scenario, args.steps, seed=0), feature_names)
+        t0 = time.perf_counter()
+        for i in range(len(x)):
+            xgb.predict_proba(x[i:i + 1])
+        per_row_us = (time.perf_counter() - t0) / len(x) * 1e6
+
+        probs = np.concatenate([run["failure_prob"].to_numpy() for run in runs])
+        print(f"{scenario:<20} {batch_us:>14.1f} {per_row_us:>16.1f} "
+              f"{probs.mean():>10.3f} {probs.max():>9.3f} {(probs >= 0.6).mean():>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
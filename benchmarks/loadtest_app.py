@@ -0,0 +1,395 @@
+"""
+Concurrent-session load test for the Streamlit app
+
+Starts one `streamlit run app.py` server and drives N concurrent browser-like
+sessions against it over Streamlit's websocket protocol (/_stcore/stream).
+Each session runs the risk calculator, asks RiskBot a question (answered by
+the local stub LLM) and runs a short live-monitoring pass. Because every
+session shares the same server process, its caches and its script threads,
+the numbers describe the capacity of a single app instance.
+
+Reports per-action latency percentiles (request sent to script_finished),
+CPU and RSS of the server process, and how much the server's RSS grows per
+connected session, which is dominated by st.session_state. One
+capacity-curve row is written per session count so the curve can be
+compared between releases.
+
+    python benchmarks/loadtest_app.py --sessions 1 2 4 8 --rounds 3 --out capacity.csv
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from llm_stub import StubLLMServer  # noqa: E402
+
+try:
+    import psutil
+except ImportError:  # CPU/RSS columns are left out without psutil
+    psutil = None
+
+
+APP_PATH = os.path.join(ROOT, "app.py")
+
+# Bounds of the app's "Steps to simulate" input; values outside are not applied
+LIVE_STEPS_RANGE = (20, 300)
+
+QUESTIONS = [
+    "Why is high torque dangerous?",
+    "How can we reduce false alarms?",
+    "What features matter most?",
+    "What maintenance schedule do you recommend?",
+]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StreamlitServer:
+    """
+    One headless `streamlit run` process for the duration of a with-block
+
+    Parameters:
+    - script: App script to serve
+    - env: Extra environment variables (e.g. the stub LLM endpoint)
+    - startup_timeout: Seconds to wait for /_stcore/health
+    """
+
+    def __init__(self, script=APP_PATH, env=None, startup_timeout=120):
+        self.script = script
+        self.env = dict(os.environ, **(env or {}))
+        self.startup_timeout = startup_timeout
+        self.port = _free_port()
+        self.process = None
+
+    @property
+    def ws_url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", self.script,
+             "--server.headless", "true",
+             "--server.port", str(self.port),
+             "--server.address", "127.0.0.1",
+             "--browser.gatherUsageStats", "false"],
+            cwd=ROOT,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"streamlit exited with code {self.process.returncode}")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1)
+                return self
+            except OSError:
+                time.sleep(0.25)
+        self.__exit__()
+        raise TimeoutError("streamlit server did not become healthy")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class AppSession:
+    """
+    A minimal browser stand-in speaking Streamlit's websocket protocol
+
+    Widgets are looked up by label from the elements the last script run
+    sent. Values set with set_value are resent on every rerun, like the
+    frontend does, and clicks are one-shot triggers.
+    """
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.widgets = {}
+        self.values = {}
+        self._ws = None
+
+    async def connect(self):
+        self._ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+
+    def set_value(self, label, value):
+        kind, widget = self.widgets[label]
+        state = self.values.setdefault(widget.id, {})
+        state.clear()
+        if kind == "number_input":
+            key = "int_value" if widget.data_type == NumberInput.INT else "double_value"
+            state[key] = int(value) if key == "int_value" else float(value)
+        else:
+            state["string_value"] = str(value)
+
+    async def run(self, click=None):
+        """Trigger one rerun (optionally clicking a button) and wait for it to finish"""
+        msg = BackMsg()
+        rerun = msg.rerun_script
+        rerun.query_string = ""
+        rerun.page_script_hash = ""
+        for widget_id, state in self.values.items():
+            widget_state = rerun.widget_states.widgets.add(id=widget_id)
+            for key, value in state.items():
+                setattr(widget_state, key, value)
+        if click is not None:
+            rerun.widget_states.widgets.add(id=self.widgets[click][1].id, trigger_value=True)
+
+        await self._ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._receive_until_finished(), self.timeout)
+
+    async def _receive_until_finished(self):
+        error = None
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self._ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind == "exception":
+                    error = element.exception.message
+                    continue
+                widget = getattr(element, element_kind)
+                if getattr(widget, "id", "") and getattr(widget, "label", ""):
+                    self.widgets[widget.label] = (element_kind, widget)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if error is not None:
+                    raise RuntimeError(error)
+                return
+
+
+class ResourceSampler:
+    """Samples CPU% and RSS of one process (and its children) in a background thread"""
+
+    def __init__(self, pid, interval=0.25):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._proc = psutil.Process(pid) if psutil else None
+        self._seen = {}
+
+    def rss(self):
+        if self._proc is None:
+            return None
+        return sum(p.memory_info().rss for p in [self._proc] + self._proc.children(recursive=True))
+
+    def _sample(self):
+        cpu, rss = 0.0, 0
+        for proc in [self._proc] + self._proc.children(recursive=True):
+            try:
+                tracked = self._seen.setdefault(proc.pid, proc)
+                cpu += tracked.cpu_percent(None)
+                rss += tracked.memory_info().rss
+            except psutil.Error:
+                self._seen.pop(proc.pid, None)
+        return cpu, rss
+
+    def _run(self):
+        if self._proc is None:
+            return
+        while not self._stop.wait(self.interval):
+            self.samples.append(self._sample())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def run_session(url, session_id, rounds, live_steps, timeout, start, sampler):
+    """
+    Drive one simulated operator through calculator, chatbot and live monitor
+
+    Parameters:
+    - url: Websocket URL of the server
+    - session_id: Seed and label for this session
+    - rounds: Calculator/chat/monitor cycles to run
+    - live_steps: Steps per live-monitoring pass
+    - timeout: Seconds allowed per script run
+    - start: asyncio.Event so all sessions start together
+    - sampler: ResourceSampler of the server, read after each action
+
+    Returns:
+    - Tuple of (session, list of dicts (session, round, action, latency_s, server_rss_mb))
+    """
+    rng = random.Random(session_id)
+    session = AppSession(url, timeout)
+    records = []
+
+    async def timed(action, round_idx, click=None):
+        t0 = time.perf_counter()
+        await session.run(click)
+        latency = time.perf_counter() - t0
+        rss = sampler.rss()
+        records.append({
+            "session": session_id,
+            "round": round_idx,
+            "action": action,
+            "latency_s": latency,
+            "server_rss_mb": rss / 2**20 if rss is not None else np.nan,
+        })
+
+    await session.connect()
+    await start.wait()
+    await timed("initial_load", 0)
+
+    for round_idx in range(1, rounds + 1):
+        session.set_value("Torque (Nm)", round(rng.uniform(20, 70), 1))
+        session.set_value("Tool Wear (minutes)", round(rng.uniform(0, 250), 1))
+        await timed("calculator", round_idx, click="🔍 Analyze Machine Health")
+
+        session.set_value("Your question:", rng.choice(QUESTIONS))
+        await timed("chatbot", round_idx, click="🚀 Ask RiskBot")
+
+        session.set_value("Steps to simulate", live_steps)
+        session.set_value("Update delay (sec)", 0.1)
+        await timed("live_monitor", round_idx, click="▶️ Start Monitoring")
+
+    return session, records
+
+
+async def _run_sessions(server, n_sessions, rounds, live_steps, timeout, sampler):
+    start = asyncio.Event()
+    tasks = [
+        asyncio.ensure_future(
+            run_session(server.ws_url, i, rounds, live_steps, timeout, start, sampler)
+        )
+        for i in range(n_sessions)
+    ]
+    await asyncio.sleep(0.5)  # let every session connect before the clock starts
+    t0 = time.perf_counter()
+    start.set()
+    results = await asyncio.gather(*tasks)
+    wall = time.perf_counter() - t0
+
+    # Measured while every session is still connected and holding its state
+    rss_end = sampler.rss()
+    for session, _ in results:
+        await session.close()
+    return [r for _, records in results for r in records], wall, rss_end
+
+
+async def _warm_up(server, timeout):
+    """Load the app once so cached models and data are not charged to the first session"""
+    session = AppSession(server.ws_url, timeout)
+    await session.connect()
+    await session.run()
+    await session.close()
+
+
+def run_level(server, n_sessions, rounds, live_steps, timeout):
+    """Run n_sessions concurrently against the server and summarise one capacity-curve point"""
+    asyncio.run(_warm_up(server, timeout))
+    with ResourceSampler(server.process.pid) as sampler:
+        rss_start = sampler.rss()
+        records, wall, rss_end = asyncio.run(
+            _run_sessions(server, n_sessions, rounds, live_steps, timeout, sampler)
+        )
+
+    df = pd.DataFrame(records)
+    row = {"sessions": n_sessions, "wall_s": wall, "actions_per_s": len(df) / wall}
+    for action, group in df.groupby("action"):
+        row[f"{action}_p50_s"] = float(np.percentile(group["latency_s"], 50))
+        row[f"{action}_p95_s"] = float(np.percentile(group["latency_s"], 95))
+
+    if sampler.samples:
+        cpu, rss = zip(*sampler.samples)
+        row["cpu_pct_mean"] = float(np.mean(cpu))
+        row["cpu_pct_max"] = float(np.max(cpu))
+        row["rss_mb_max"] = float(np.max(rss) / 2**20)
+        row["rss_growth_mb_per_session"] = float((rss_end - rss_start) / n_sessions / 2**20)
+    return row, df
+
+
+def _live_steps(value):
+    steps = int(value)
+    low, high = LIVE_STEPS_RANGE
+    if not low <= steps <= high:
+        raise argparse.ArgumentTypeError(f"the app accepts {low}-{high} steps, got {steps}")
+    return steps
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rounds", type=int, default=3, help="Calculator/chat/monitor cycles per session")
+    parser.add_argument("--live-steps", type=_live_steps, default=20,
+                        help=f"Steps per live-monitoring pass ({LIVE_STEPS_RANGE[0]}-{LIVE_STEPS_RANGE[1]}, as the app allows)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub LLM response time (s)")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per script run")
+    parser.add_argument("--out", help="Append capacity-curve rows to this CSV")
+    parser.add_argument("--raw-out", help="Write every per-action record to this CSV")
+    args = parser.parse_args()
+
+    revision = _git_revision()
+    rows, raw = [], []
+    with StubLLMServer(latency=args.llm_latency) as stub:
+        env = {"GROQ_API_KEY": "stub", "GROQ_BASE_URL": stub.base_url}
+        # A fresh server per level, so RSS growth is not inherited from the previous one
+        for n in args.sessions:
+            with StreamlitServer(env=env) as server:
+                row, df = run_level(server, n, args.rounds, args.live_steps, args.timeout)
+            row["revision"] = revision
+            rows.append(row)
+            raw.append(df.assign(level=n))
+            print(
+                f"sessions={n:>3}  calc p95={row['calculator_p95_s']:.2f}s  "
+                f"chat p95={row['chatbot_p95_s']:.2f}s  live p95={row['live_monitor_p95_s']:.2f}s  "
+                f"cpu={row.get('cpu_pct_mean', float('nan')):.0f}%  "
+                f"rss={row.get('rss_mb_max', float('nan')):.0f}MB  "
+                f"+{row.get('rss_growth_mb_per_session', float('nan')):.1f}MB/session"
+            )
+
+    curve = pd.DataFrame(rows)
+    if args.out:
+        curve.to_csv(args.out, mode="a", index=False, header=not os.path.exists(args.out))
+    if args.raw_out:
+        pd.concat(raw, ignore_index=True).to_csv(args.raw_out, index=False)
+
+
+if __name__ == "__main__":
+    main()
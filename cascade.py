@@ -0,0 +1,222 @@
+"""
+Two-stage cascade scoring: a scaled logistic screen, XGBoost only when unsure
+
+The notebook's LogisticRegression (on scaler.pkl features) is folded into one
+weight vector over raw features, so screening a row is a single dot product.
+Rows whose screen score falls inside an uncertainty band are passed to the
+300-tree XGBoost model; the rest are decided by the screen. The band is chosen
+on held-out data so that every row XGBoost flags there stays inside or above
+the band, i.e. the cascade loses no recall against XGBoost alone on that data.
+
+    python cascade.py fit          # train the screen, pick the band, write cascade.pkl
+    python cascade.py bench        # throughput and agreement of both modes
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import precision_score, recall_score
+from sklearn.model_selection import train_test_split
+
+from scoring import BASE_DIR, load_artifacts, load_training_data, notebook_split
+
+
+CASCADE_PATH = os.path.join(BASE_DIR, "cascade.pkl")
+
+# Extra log-odds of slack on each side of the band beyond the held-out extremes
+DEFAULT_MARGIN = 0.5
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+class CascadeScorer:
+    """
+    Screen every row with a linear model, score only uncertain rows with XGBoost
+
+    Exposes predict_proba/predict like the classifiers it wraps, so it can be
+    pickled and dropped into batch_scoring in place of the XGBoost model.
+
+    Parameters:
+    - xgb: Fitted XGBClassifier
+    - weights: Screen weights over raw features (scaler folded in)
+    - bias: Screen intercept
+    - low: Screen log-odds below which a row is healthy without XGBoost
+    - high: Screen log-odds above which a row is a failure without XGBoost
+    - threshold: Probability cut-off used for predict
+    """
+
+    def __init__(self, xgb, weights, bias, low, high, threshold=0.5):
+        self.xgb = xgb
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.low = float(low)
+        self.high = float(high)
+        self.threshold = threshold
+        self.last_pass_rate = None
+
+    def set_params(self, **params):
+        """Forward threading settings to the wrapped XGBoost model"""
+        self.xgb.set_params(**params)
+        return self
+
+    def screen(self, X):
+        """Screen log-odds for every row (one matrix-vector product)"""
+        return np.asarray(X, dtype=np.float64) @ self.weights + self.bias
+
+    def predict_proba(self, X):
+        """
+        Failure probabilities, XGBoost's for band rows and the screen's elsewhere
+
+        Screened rows keep the screen probability but are clipped to the side
+        of `threshold` the band decided, so predict agrees with the band.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        score = self.screen(X)
+        prob = _sigmoid(score)
+
+        below = score < self.low
+        above = score > self.high
+        band = ~(below | above)
+        prob[below] = np.minimum(prob[below], np.nextafter(self.threshold, 0))
+        prob[above] = np.maximum(prob[above], self.threshold)
+        if band.any():
+            prob[band] = self.xgb.predict_proba(X[band])[:, 1]
+
+        self.last_pass_rate = float(band.mean()) if len(X) else 0.0
+        return np.column_stack([1.0 - prob, prob])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] >= self.threshold).astype(int)
+
+
+def fold_scaler(log_reg, scaler):
+    """Rewrite a LogisticRegression on scaled inputs as weights on raw inputs"""
+    coef = log_reg.coef_[0] / scaler.scale_
+    bias = log_reg.intercept_[0] - np.sum(coef * scaler.mean_)
+    return coef, bias
+
+
+def choose_band(score, xgb_pred, margin=DEFAULT_MARGIN):
+    """
+    Pick (low, high) so held-out XGBoost decisions are reproduced exactly
+
+    - low: below every row XGBoost flags, so no flagged row is screened out
+    - high: above every row XGBoost clears, so no cleared row is force-flagged
+    """
+    positives = score[xgb_pred == 1]
+    negatives = score[xgb_pred == 0]
+    low = positives.min() - margin if len(positives) else np.inf
+    high = negatives.max() + margin if len(negatives) else -np.inf
+    return float(low), float(max(high, low))
+
+
+def fit_cascade(margin=DEFAULT_MARGIN, calibration_size=0.25, seed=42):
+    """
+    Train the screen and choose the uncertainty band
+
+    The screen is the notebook's LogisticRegression (balanced, max_iter=2000)
+    on scaler.pkl features, fit on part of the training split; the band is
+    chosen on the rest. The notebook's test split is only used for reporting.
+
+    Returns:
+    - Tuple of (CascadeScorer, report dict)
+    """
+    xgb, scaler, feature_names = load_artifacts()
+    X, y, _ = load_training_data(feature_names=feature_names)
+    X_train, X_test, y_train, y_test = notebook_split(X, y)
+    X_fit, X_cal, y_fit, y_cal = train_test_split(
+        X_train, y_train, test_size=calibration_size, stratify=y_train, random_state=seed
+    )
+
+    log_reg = LogisticRegression(max_iter=2000, class_weight="balanced")
+    log_reg.fit(scaler.transform(X_fit), y_fit)
+    weights, bias = fold_scaler(log_reg, scaler)
+
+    X_cal = X_cal.to_numpy()
+    cal_score = X_cal @ weights + bias
+    low, high = choose_band(cal_score, xgb.predict(X_cal), margin)
+    cascade = CascadeScorer(xgb, weights, bias, low, high)
+
+    X_test = X_test.to_numpy()
+    xgb_pred = xgb.predict(X_test)
+    cascade_pred = cascade.predict(X_test)
+    report = {
+        "low": low,
+        "high": high,
+        "calibration_pass_rate": float(((cal_score >= low) & (cal_score <= high)).mean()),
+        "test_pass_rate": cascade.last_pass_rate,
+        "test_agreement": float((xgb_pred == cascade_pred).mean()),
+        "test_recall_xgb": float(recall_score(y_test, xgb_pred)),
+        "test_recall_cascade": float(recall_score(y_test, cascade_pred)),
+        "test_precision_xgb": float(precision_score(y_test, xgb_pred)),
+        "test_precision_cascade": float(precision_score(y_test, cascade_pred)),
+    }
+    return cascade, report
+
+
+def benchmark(cascade, X, repeats=3):
+    """
+    Rows/second of XGBoost alone vs the cascade on the same matrix
+
+    Returns:
+    - Dict with both throughputs, the speedup and the fraction passed to XGBoost
+    """
+    def best_time(fn):
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            fn(X)
+            times.append(time.perf_counter() - t0)
+        return min(times)
+
+    xgb_s = best_time(cascade.xgb.predict_proba)
+    cascade_s = best_time(cascade.predict_proba)
+    return {
+        "rows": len(X),
+        "xgb_rows_per_s": len(X) / xgb_s,
+        "cascade_rows_per_s": len(X) / cascade_s,
+        "speedup": xgb_s / cascade_s,
+        "pass_rate": cascade.last_pass_rate,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logistic screen + XGBoost cascade")
+    parser.add_argument("command", choices=["fit", "bench"])
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN)
+    parser.add_argument("--output", default=CASCADE_PATH)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows for the throughput benchmark")
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        cascade, report = fit_cascade(margin=args.margin)
+        joblib.dump(cascade, args.output)
+        print(f"Band: screen log-odds in [{report['low']:.2f}, {report['high']:.2f}] -> XGBoost")
+        print(f"Rows passed to XGBoost: {report['calibration_pass_rate']:.1%} (held-out), "
+              f"{report['test_pass_rate']:.1%} (test)")
+        print(f"Test recall    XGBoost {report['test_recall_xgb']:.3f}  cascade {report['test_recall_cascade']:.3f}")
+        print(f"Test precision XGBoost {report['test_precision_xgb']:.3f}  cascade {report['test_precision_cascade']:.3f}")
+        print(f"Decision agreement with XGBoost on test: {report['test_agreement']:.2%}")
+        print(f"Saved cascade to {args.output}")
+    else:
+        cascade = joblib.load(args.output)
+        X, _, _ = load_training_data()
+        rng = np.random.default_rng(0)
+        X = X.to_numpy()[rng.integers(0, len(X), size=args.rows)]
+        stats = benchmark(cascade, X)
+        print(f"{stats['rows']:,} rows: XGBoost {stats['xgb_rows_per_s']:,.0f} rows/s, "
+              f"cascade {stats['cascade_rows_per_s']:,.0f} rows/s "
+              f"({stats['speedup']:.1f}x, {stats['pass_rate']:.1%} passed to XGBoost)")
+
+
+if __name__ == "__main__":
+    # Run via the importable module so pickles reference cascade.CascadeScorer,
+    # not __main__.CascadeScorer
+    import cascade
+
+    cascade.main()
@@ -0,0 +1,199 @@
+"""
+Single-pass multi-label failure prediction (overall risk + TWF/HDF/PWF/OSF/RNF)
+
+One XGBoost model with vector-valued leaves (multi_strategy="multi_output_tree")
+is trained on Machine failure and the five AI4I failure-mode labels together.
+A single predict call walks one set of trees and returns every probability,
+instead of running one binary model per mode.
+
+    python failure_modes.py fit      # train, report per-mode metrics, write failure_modes.pkl
+    python failure_modes.py bench    # latency vs the single binary model
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.metrics import average_precision_score, precision_score, recall_score
+from xgboost import XGBClassifier
+
+from scoring import (
+    BASE_DIR,
+    FAILURE_MODES,
+    MODEL_PATH,
+    TARGET_COLUMN,
+    load_training_data,
+    notebook_split,
+)
+
+
+FAILURE_MODES_PATH = os.getenv("FAILURE_MODES_PATH", os.path.join(BASE_DIR, "failure_modes.pkl"))
+
+OUTPUTS = (TARGET_COLUMN,) + tuple(FAILURE_MODES)
+
+
+class FailureModeModel:
+    """
+    Multi-output classifier for overall failure risk and each failure mode
+
+    predict_proba/predict expose the overall "Machine failure" output like a
+    binary classifier, so the model can also stand in for xgb_model.pkl.
+
+    Parameters:
+    - booster_model: Fitted multi-output XGBClassifier (one column per output)
+    - outputs: Label name of each output column
+    - threshold: Probability cut-off used for predict
+    """
+
+    def __init__(self, booster_model, outputs=OUTPUTS, threshold=0.5):
+        self.model = booster_model
+        self.outputs = tuple(outputs)
+        self.threshold = threshold
+
+    @property
+    def mode_names(self):
+        return self.outputs[1:]
+
+    def set_params(self, **params):
+        """Forward threading settings to the wrapped XGBoost model"""
+        self.model.set_params(**params)
+        return self
+
+    def predict_all(self, X):
+        """Probability of every output, shape (n_rows, len(outputs)), in one pass"""
+        return self.model.predict_proba(np.asarray(X, dtype=np.float64))
+
+    def predict_proba(self, X):
+        prob = self.predict_all(X)[:, 0]
+        return np.column_stack([1.0 - prob, prob])
+
+    def predict(self, X):
+        return (self.predict_all(X)[:, 0] >= self.threshold).astype(int)
+
+
+def load_failure_mode_model(path=FAILURE_MODES_PATH):
+    """The trained multi-output model, or None if failure_modes.py has not been run"""
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+def fit_failure_modes(n_estimators=300, max_depth=6, learning_rate=0.05, seed=42):
+    """
+    Train the multi-output model on the notebook's training split
+
+    Uses the notebook's XGBoost settings. Rows with any failure label are
+    weighted by the notebook's scale_pos_weight, since a per-output
+    scale_pos_weight is not available for multi-output trees.
+
+    Returns:
+    - Tuple of (FailureModeModel, report dict with per-output test metrics)
+    """
+    X, y, df = load_training_data()
+    labels = df[list(OUTPUTS)].astype(int)
+    X_train, X_test, y_train, _ = notebook_split(X, y)
+    Y_train, Y_test = labels.loc[X_train.index].to_numpy(), labels.loc[X_test.index].to_numpy()
+
+    scale_pos_weight = float((y_train == 0).sum() / (y_train == 1).sum())
+    weights = np.where(Y_train.any(axis=1), scale_pos_weight, 1.0)
+
+    booster_model = XGBClassifier(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        learning_rate=learning_rate,
+        subsample=0.8,
+        colsample_bytree=0.8,
+        tree_method="hist",
+        multi_strategy="multi_output_tree",
+        eval_metric="logloss",
+        n_jobs=-1,
+        random_state=seed,
+    )
+    booster_model.fit(X_train.to_numpy(), Y_train, sample_weight=weights)
+    model = FailureModeModel(booster_model)
+
+    probs = model.predict_all(X_test.to_numpy())
+    report = {"scale_pos_weight": scale_pos_weight, "test": {}}
+    for j, name in enumerate(OUTPUTS):
+        y_true, pred = Y_test[:, j], probs[:, j] >= model.threshold
+        report["test"][name] = {
+            "positives": int(y_true.sum()),
+            "recall": float(recall_score(y_true, pred, zero_division=0)),
+            "precision": float(precision_score(y_true, pred, zero_division=0)),
+            "average_precision": float(average_precision_score(y_true, probs[:, j])),
+        }
+
+    baseline_pred = joblib.load(MODEL_PATH).predict(X_test.to_numpy())
+    report["baseline_test"] = {
+        "recall": float(recall_score(Y_test[:, 0], baseline_pred)),
+        "precision": float(precision_score(Y_test[:, 0], baseline_pred)),
+    }
+    return model, report
+
+
+def benchmark(model, baseline, X, batch_sizes=(1, 100, 10_000), repeats=20):
+    """
+    Latency of one multi-output pass vs the binary model
+
+    "binary x outputs" times the binary model once per output, i.e. what a
+    separate model per failure mode would cost at the same size.
+
+    Returns:
+    - List of dicts (batch, binary_ms, multi_ms, per_model_ms), best of `repeats`
+    """
+    def best_ms(fn, x):
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            fn(x)
+            times.append(time.perf_counter() - t0)
+        return min(times) * 1000
+
+    rows = []
+    for batch in batch_sizes:
+        x = X[:batch]
+        binary_ms = best_ms(baseline.predict_proba, x)
+        rows.append({
+            "batch": len(x),
+            "binary_ms": binary_ms,
+            "multi_ms": best_ms(model.predict_all, x),
+            "per_model_ms": binary_ms * len(model.outputs),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-label failure-mode model")
+    parser.add_argument("command", choices=["fit", "bench"])
+    parser.add_argument("--output", default=FAILURE_MODES_PATH)
+    parser.add_argument("--threads", type=int, default=1, help="Threads for the latency benchmark")
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        model, report = fit_failure_modes()
+        joblib.dump(model, args.output)
+        print(f"{'output':<16} {'positives':>9} {'recall':>7} {'precision':>9} {'avg prec':>9}")
+        for name, m in report["test"].items():
+            print(f"{name:<16} {m['positives']:>9} {m['recall']:>7.3f} {m['precision']:>9.3f} "
+                  f"{m['average_precision']:>9.3f}")
+        base = report["baseline_test"]
+        print(f"Binary model (xgb_model.pkl): recall {base['recall']:.3f} precision {base['precision']:.3f}")
+        print(f"Saved model to {args.output}")
+    else:
+        model = joblib.load(args.output).set_params(n_jobs=args.threads)
+        baseline = joblib.load(MODEL_PATH)
+        baseline.set_params(n_jobs=args.threads)
+        X, _, _ = load_training_data()
+        X = np.tile(X.to_numpy(), (2, 1))
+        print(f"{'batch':>6} {'binary ms':>10} {'multi-label ms':>15} {'binary x outputs ms':>20}")
+        for row in benchmark(model, baseline, X):
+            print(f"{row['batch']:>6} {row['binary_ms']:>10.2f} {row['multi_ms']:>15.2f} "
+                  f"{row['per_model_ms']:>20.2f}")
+
+
+if __name__ == "__main__":
+    # Run via the importable module so pickles reference failure_modes.FailureModeModel
+    import failure_modes
+
+    failure_modes.main()
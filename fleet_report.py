@@ -0,0 +1,207 @@
+"""
+Fleet-level shift handover report
+
+Ranks machines by failure probability, packs compact summaries of the top
+offenders into as few LLM prompts as the token budget allows, runs those
+prompts concurrently and assembles one shift report.
+
+    python fleet_report.py --stub --machines 200
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from groq_client import GROQ_BASE_URL, ResilientLLMClient, estimate_tokens
+from scoring import DATA_PATH, engineer_features, load_artifacts, predict_failure_proba
+
+
+PROMPT_HEADER = """You are a senior predictive maintenance engineer preparing a shift handover.
+Each line below is one machine: ID, failure probability, then key signals
+(T=torque Nm, n=speed rpm, wear=tool wear min, dT=process-air temp delta K, P=power kW).
+
+{summaries}
+
+For every machine write exactly one line: "<ID> - <condition> - <action>".
+Simple English, no markdown, at most 25 words per line."""
+
+
+def rank_machines(df, model, feature_names, id_column="Product ID"):
+    """
+    Score the latest snapshot of every machine and sort by failure probability
+
+    Parameters:
+    - df: Sensor frame with one or more rows per machine
+    - model: Fitted classifier with predict_proba
+    - feature_names: Feature order the model was trained with
+    - id_column: Column identifying the machine
+
+    Returns:
+    - DataFrame of one row per machine, highest failure_prob first
+    """
+    latest = engineer_features(df.groupby(id_column, sort=False).tail(1))
+    latest = latest.reset_index(drop=True)
+    latest["failure_prob"] = predict_failure_proba(model, latest, feature_names)
+    return latest.sort_values("failure_prob", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def summarize_machine(row, id_column="Product ID"):
+    """One compact line of the signals the report prompt asks about"""
+    return (
+        f"{row[id_column]} p={row['failure_prob']:.2f} "
+        f"T={row['Torque_(Nm)']:.1f} n={row['Rotational_speed_(rpm)']:.0f} "
+        f"wear={row['Tool_wear_(min)']:.0f} dT={row['Temp_delta']:.1f} "
+        f"P={row['Power_est'] / 1000:.1f}"
+    )
+
+
+def pack_prompts(summaries, token_budget):
+    """
+    Greedily pack summary lines into prompts that fit the token budget
+
+    Parameters:
+    - summaries: Summary lines, already in priority order
+    - token_budget: Maximum estimated input tokens per prompt
+
+    Returns:
+    - List of (prompt, batch) pairs, where batch is the list of summary lines
+      packed into that prompt, in the original order
+    """
+    base_tokens = estimate_tokens(PROMPT_HEADER.format(summaries=""))
+    if base_tokens >= token_budget:
+        raise ValueError(
+            f"token_budget={token_budget} is smaller than the prompt header (~{base_tokens} tokens)"
+        )
+
+    batches = []
+    current, current_tokens = [], base_tokens
+    for line in summaries:
+        line_tokens = estimate_tokens(line + "\n")
+        if current and current_tokens + line_tokens > token_budget:
+            batches.append(current)
+            current, current_tokens = [], base_tokens
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        batches.append(current)
+
+    return [(PROMPT_HEADER.format(summaries="\n".join(batch)), batch) for batch in batches]
+
+
+def generate_fleet_report(
+    df,
+    complete,
+    model,
+    feature_names,
+    id_column="Product ID",
+    top_n=25,
+    min_prob=0.5,
+    token_budget=1500,
+    max_concurrency=4,
+):
+    """
+    Build one shift report for the whole fleet
+
+    Parameters:
+    - df: Sensor frame with one or more rows per machine
+    - complete: Callable(prompt, fallback=None) -> str that calls the LLM
+      (e.g. ResilientLLMClient.complete); fallback(prompt) is used when it fails
+    - model: Fitted classifier with predict_proba
+    - feature_names: Feature order the model was trained with
+    - id_column: Column identifying the machine
+    - top_n: Maximum number of machines handed to the LLM
+    - min_prob: Only machines at or above this probability are reported
+    - token_budget: Maximum estimated input tokens per prompt
+    - max_concurrency: Maximum LLM requests in flight
+
+    Returns:
+    - Dict with the report text, the ranked frame and prompt/latency stats
+    """
+    ranked = rank_machines(df, model, feature_names, id_column=id_column)
+    offenders = ranked[ranked["failure_prob"] >= min_prob].head(top_n)
+
+    summaries = [summarize_machine(row, id_column) for _, row in offenders.iterrows()]
+    packed = pack_prompts(summaries, token_budget) if summaries else []
+    prompts = [prompt for prompt, _ in packed]
+
+    def run(prompt, batch):
+        # If the LLM is down, the batch's own summary lines keep every offender in the report
+        return complete(prompt, fallback=lambda _prompt: "\n".join(batch))
+
+    if packed:
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            sections = list(pool.map(run, *zip(*packed)))
+    else:
+        sections = []
+
+    n_high = int((ranked["failure_prob"] >= min_prob).sum())
+    lines = [
+        f"SHIFT MAINTENANCE REPORT - {datetime.now():%Y-%m-%d %H:%M}",
+        f"Machines assessed: {len(ranked)}",
+        f"Machines at or above {min_prob:.0%} failure risk: {n_high}",
+        f"Fleet average failure risk: {ranked['failure_prob'].mean():.1%}",
+        "",
+    ]
+    if sections:
+        lines.append(f"Top {len(offenders)} machines by risk:")
+        lines.extend(section.strip() for section in sections)
+    else:
+        lines.append("No machines above the risk threshold. Continue routine monitoring.")
+
+    return {
+        "report": "\n".join(lines),
+        "ranked": ranked,
+        "n_prompts": len(prompts),
+        "prompt_tokens": [estimate_tokens(p) for p in prompts],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a fleet-level shift report")
+    parser.add_argument("--input", default=DATA_PATH, help="Sensor CSV (AI4I layout)")
+    parser.add_argument("--machines", type=int, default=200, help="Machines to sample from the input")
+    parser.add_argument("--top-n", type=int, default=25)
+    parser.add_argument("--min-prob", type=float, default=0.5)
+    parser.add_argument("--token-budget", type=int, default=1500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base-url", default=os.getenv("GROQ_BASE_URL", GROQ_BASE_URL))
+    parser.add_argument("--stub", action="store_true", help="Serve answers from a local stub LLM")
+    args = parser.parse_args()
+
+    from openai import OpenAI
+
+    from llm_stub import StubLLMServer
+
+    xgb, _, feature_names = load_artifacts()
+    df = pd.read_csv(args.input, encoding="utf-8-sig")
+    df = df.sample(n=min(args.machines, len(df)), random_state=42)
+
+    stub = StubLLMServer().start() if args.stub else None
+    try:
+        client = OpenAI(
+            api_key=os.getenv("GROQ_API_KEY", "stub") if stub is None else "stub",
+            base_url=stub.base_url if stub is not None else args.base_url,
+        )
+        llm = ResilientLLMClient(client, max_concurrency=args.concurrency)
+        result = generate_fleet_report(
+            df,
+            llm.complete,
+            xgb,
+            feature_names,
+            top_n=args.top_n,
+            min_prob=args.min_prob,
+            token_budget=args.token_budget,
+            max_concurrency=args.concurrency,
+        )
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    print(result["report"])
+    print(f"\n[{result['n_prompts']} prompt(s), est. tokens {result['prompt_tokens']}]")
+
+
+if __name__ == "__main__":
+    main()
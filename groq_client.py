@@ -0,0 +1,370 @@
+"""
+Resilient wrapper around the Groq (OpenAI-compatible) client
+
+Adds what the raw client lacks under load: a token-bucket rate limiter,
+bounded concurrency, per-attempt timeouts under an overall per-call deadline,
+jittered exponential backoff on 429/5xx and a circuit breaker that fails
+fast to a degraded response.
+"""
+import math
+import random
+import threading
+import time
+from collections import deque
+
+import openai
+
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+GROQ_MODEL = "openai/gpt-oss-20b"
+
+# Free-tier limits for openai/gpt-oss-20b on Groq
+GROQ_REQUESTS_PER_MINUTE = 30
+GROQ_TOKENS_PER_MINUTE = 8000
+
+# Rough chars-per-token ratio for English/numeric text on GPT-style tokenizers
+CHARS_PER_TOKEN = 4
+
+DEGRADED_RESPONSE = (
+    "AI recommendations are temporarily unavailable. The model prediction above is still valid; "
+    "check torque, speed, tool wear and temperature delta manually and retry in a minute."
+)
+
+
+def estimate_tokens(text):
+    """Cheap token estimate used for prompt packing and rate limiting"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Parameters:
+    - rate: Tokens added per second
+    - capacity: Maximum tokens held (burst size)
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1.0, timeout=None):
+        """
+        Take `amount` tokens, waiting for refill if needed
+
+        Returns:
+        - True if the tokens were taken, False if `timeout` expired first
+        """
+        amount = min(float(amount), self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures, half-open
+    after `reset_timeout` seconds, closed again on the first success
+
+    Parameters:
+    - failure_threshold: Consecutive failures that open the circuit
+    - reset_timeout: Seconds to stay open before letting one probe through
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may go upstream now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def is_open(self):
+        """True while failing fast (open and not yet due for a probe)"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        """Give back a half-open probe slot without judging upstream health"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def _is_retryable(exc):
+    if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+def _retry_after(exc):
+    """Seconds requested by a Retry-After header, if the error carries one"""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ResilientLLMClient:
+    """
+    Rate-limited, retrying, circuit-broken prompt -> text client
+
+    One instance should be shared per process so every session draws from
+    the same rate limit and concurrency budget.
+
+    Parameters:
+    - client: OpenAI-compatible client (openai.OpenAI)
+    - model: Model name passed to responses.create
+    - requests_per_minute: Request token-bucket rate
+    - tokens_per_minute: Estimated prompt-token bucket rate (None disables it)
+    - max_concurrency: Maximum upstream calls in flight
+    - timeout: Per-attempt timeout in seconds
+    - max_retries: Retries after the first attempt on 429/5xx/timeouts
+    - backoff_base: First backoff delay in seconds (doubles per retry)
+    - backoff_max: Cap on a single backoff delay in seconds (a longer Retry-After is honoured)
+    - failure_threshold: Consecutive failed calls that open the circuit
+    - reset_timeout: Seconds the circuit stays open before probing
+    - queue_timeout: Max seconds to wait for rate limit / concurrency slot
+    - deadline: Max seconds for a whole call (queueing, attempts and backoff);
+      past it the call degrades instead of starting another attempt
+    """
+
+    def __init__(
+        self,
+        client,
+        model=GROQ_MODEL,
+        requests_per_minute=GROQ_REQUESTS_PER_MINUTE,
+        tokens_per_minute=GROQ_TOKENS_PER_MINUTE,
+        max_concurrency=4,
+        timeout=20.0,
+        max_retries=3,
+        backoff_base=0.5,
+        backoff_max=8.0,
+        failure_threshold=5,
+        reset_timeout=30.0,
+        queue_timeout=30.0,
+        deadline=45.0,
+    ):
+        # Retries and timeouts are handled here, not by the SDK
+        self.client = client.with_options(max_retries=0, timeout=timeout)
+        self.model = model
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.deadline = deadline
+
+        self.request_bucket = TokenBucket(
+            requests_per_minute / 60.0, max(1.0, requests_per_minute / 10.0)
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute / 60.0, tokens_per_minute / 4.0)
+            if tokens_per_minute
+            else None
+        )
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self._counters = {
+            "calls": 0,
+            "successes": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "server_errors": 0,
+            "other_errors": 0,
+            "short_circuited": 0,
+            "queue_timeouts": 0,
+            "deadline_exceeded": 0,
+            "degraded": 0,
+        }
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def _backoff_delay(self, attempt, exc):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(0, delay)  # full jitter
+        requested = _retry_after(exc)
+        if requested is not None:
+            # The server knows when it will accept us again; the call deadline still caps this
+            delay = max(delay, requested)
+        return delay
+
+    def _degrade(self, prompt, fallback):
+        self._count("degraded")
+        return fallback(prompt) if fallback is not None else DEGRADED_RESPONSE
+
+    def complete(self, prompt, fallback=None, deadline=None):
+        """
+        Send one prompt upstream, returning a degraded answer on failure
+
+        Parameters:
+        - prompt: Prompt text
+        - fallback: Optional callable(prompt) -> str used instead of DEGRADED_RESPONSE
+        - deadline: Seconds for this call overall (defaults to the client's deadline)
+
+        Returns:
+        - Model output text (or the degraded response)
+        """
+        self._count("calls")
+        end = time.monotonic() + (self.deadline if deadline is None else deadline)
+
+        def remaining():
+            return max(0.0, end - time.monotonic())
+
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            return self._degrade(prompt, fallback)
+
+        if not self.request_bucket.acquire(timeout=min(self.queue_timeout, remaining())) or (
+            self.token_bucket is not None
+            and not self.token_bucket.acquire(
+                estimate_tokens(prompt), timeout=min(self.queue_timeout, remaining())
+            )
+        ):
+            self._count("queue_timeouts")
+            self.breaker.release()
+            return self._degrade(prompt, fallback)
+
+        if not self._slots.acquire(timeout=min(self.queue_timeout, remaining())):
+            self._count("queue_timeouts")
+            self.breaker.release()
+            return self._degrade(prompt, fallback)
+
+        last_exc = None
+        try:
+            # The circuit may have opened while this call was queued
+            if self.breaker.is_open():
+                self._count("short_circuited")
+                return self._degrade(prompt, fallback)
+
+            for attempt in range(self.max_retries + 1):
+                # Each attempt gets the per-attempt timeout or what is left of the deadline
+                attempt_timeout = min(self.timeout, remaining())
+                if attempt_timeout <= 0:
+                    self._count("deadline_exceeded")
+                    break
+                t0 = time.perf_counter()
+                try:
+                    response = self.client.responses.create(
+                        model=self.model, input=prompt, timeout=attempt_timeout
+                    )
+                except openai.OpenAIError as exc:
+                    last_exc = exc
+                    if isinstance(exc, openai.APITimeoutError) and attempt_timeout < self.timeout:
+                        # Cut short by our own deadline, which says nothing about upstream health
+                        self._count("deadline_exceeded")
+                        last_exc = None
+                        break
+                    if isinstance(exc, openai.APITimeoutError):
+                        self._count("timeouts")
+                    elif isinstance(exc, openai.RateLimitError):
+                        self._count("rate_limited")
+                    elif isinstance(exc, openai.APIStatusError) and exc.status_code >= 500:
+                        self._count("server_errors")
+                    else:
+                        self._count("other_errors")
+
+                    if not _is_retryable(exc) or attempt == self.max_retries or self.breaker.is_open():
+                        break
+                    delay = self._backoff_delay(attempt, exc)
+                    if delay >= remaining():
+                        self._count("deadline_exceeded")
+                        break
+                    self._count("retries")
+                    time.sleep(delay)
+                    continue
+
+                with self._lock:
+                    self._latencies.append(time.perf_counter() - t0)
+                    self._counters["successes"] += 1
+                self.breaker.record_success()
+                return response.output_text
+        finally:
+            self._slots.release()
+
+        # Only upstream trouble (429/5xx/timeouts) counts against the circuit
+        if last_exc is not None and _is_retryable(last_exc):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+        return self._degrade(prompt, fallback)
+
+    def stats(self):
+        """
+        Snapshot of counters and latency percentiles
+
+        Returns:
+        - Dict of counters plus circuit state and p50/p95/max latency in seconds
+        """
+        with self._lock:
+            out = dict(self._counters)
+            latencies = sorted(self._latencies)
+
+        out["circuit_state"] = self.breaker.state
+        if latencies:
+            out["latency_p50_s"] = latencies[len(latencies) // 2]
+            out["latency_p95_s"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            out["latency_max_s"] = latencies[-1]
+        return out
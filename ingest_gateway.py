@@ -0,0 +1,455 @@
+"""
+Asynchronous sensor ingestion gateway
+
+Accepts sensor snapshots as line-delimited JSON over TCP (one object per
+line) or UDP (one or more lines per datagram), a local stand-in for the MQTT
+broker. Snapshots are validated against the calculator's input_dict schema,
+buffered in a bounded queue, grouped into per-interval micro-batches and
+scored in one model call per batch. Scored rows are published to the
+monitoring store, which the dashboard's Gateway Feed reads.
+
+Backpressure: with policy "block", a full queue stops the gateway reading
+from TCP sockets, so senders block in their kernel buffers. UDP cannot push
+back, so datagrams are dropped when the queue is full. Policies
+"drop_newest" and "drop_oldest" never block and count what they discard.
+
+    python ingest_gateway.py --tcp-port 9009 --udp-port 9010 --store monitoring_store.csv
+    echo '{"machine_id": "L47181", "Torque_(Nm)": 62, ...}' | nc localhost 9009
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import socket
+import time
+from collections import deque
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from scoring import (
+    BASE_DIR,
+    FEATURE_NAMES_PATH,
+    MODEL_PATH,
+    RAW_TO_MODEL_COLUMNS,
+    engineer_features,
+    to_matrix,
+)
+
+
+# Field -> (min, max), the same bounds as the calculator's inputs
+SNAPSHOT_SCHEMA = {
+    "Air_temperature_(K)": (250.0, 350.0),
+    "Process_temperature_(K)": (250.0, 400.0),
+    "Rotational_speed_(rpm)": (500.0, 3000.0),
+    "Torque_(Nm)": (0.0, 100.0),
+    "Tool_wear_(min)": (0.0, 300.0),
+}
+
+# Optional one-hot Type fields (Type H when both are 0)
+TYPE_FIELDS = ("Type_L", "Type_M")
+
+STORE_COLUMNS = [
+    "time", "machine_id", "Air_temperature_(K)", "Process_temperature_(K)",
+    "Rotational_speed_(rpm)", "Torque_(Nm)", "Tool_wear_(min)",
+    "Temp_delta", "Power_est", "failure_prob", "failure_pred",
+]
+
+POLICIES = ("block", "drop_newest", "drop_oldest")
+
+DEFAULT_STORE_PATH = os.getenv("GATEWAY_STORE_PATH", os.path.join(BASE_DIR, "monitoring_store.csv"))
+
+
+def validate_batch(records):
+    """
+    Validate a list of parsed snapshots against the input_dict schema, vectorized
+
+    Raw AI4I names ("Torque [Nm]") are accepted too. Temp_delta and Power_est
+    are always recomputed from the raw channels, as the calculator does.
+
+    Parameters:
+    - records: List of dicts decoded from JSON
+
+    Returns:
+    - Tuple of (DataFrame of valid rows with machine_id, time and model
+      features, number of rejected records)
+    """
+    if not records:
+        return pd.DataFrame(columns=STORE_COLUMNS[:-2]), 0
+
+    df = pd.DataFrame.from_records(records)
+    for raw, clean in RAW_TO_MODEL_COLUMNS.items():
+        if raw in df.columns:
+            df[clean] = df[clean].fillna(df[raw]) if clean in df.columns else df[raw]
+            df = df.drop(columns=raw)
+    valid = np.ones(len(df), dtype=bool)
+    for field, (low, high) in SNAPSHOT_SCHEMA.items():
+        if field not in df.columns:
+            return df.iloc[0:0], len(df)
+        df[field] = pd.to_numeric(df[field], errors="coerce")
+        valid &= df[field].between(low, high).to_numpy()
+
+    for field in TYPE_FIELDS:
+        if field in df.columns:
+            missing = df[field].isna().to_numpy()
+            df[field] = pd.to_numeric(df[field], errors="coerce")
+            valid &= missing | df[field].isin((0, 1)).to_numpy()
+            df[field] = df[field].fillna(0.0)
+        else:
+            df[field] = 0.0
+
+    if "machine_id" not in df.columns:
+        df["machine_id"] = "default"
+    df["machine_id"] = df["machine_id"].fillna("default").astype(str)
+    now = time.time()
+    if "time" not in df.columns:
+        df["time"] = now
+    df["time"] = pd.to_numeric(df["time"], errors="coerce").fillna(now)
+
+    out = df.loc[valid, ["time", "machine_id", *SNAPSHOT_SCHEMA, *TYPE_FIELDS]]
+    out = engineer_features(out.drop(columns=["Temp_delta", "Power_est"], errors="ignore"))
+    return out.reset_index(drop=True), int((~valid).sum())
+
+
+class MonitoringStore:
+    """
+    Append-only CSV of scored readings plus a bounded in-memory tail
+
+    Parameters:
+    - path: CSV file to append to (None = memory only)
+    - max_rows: Rows kept in memory for in-process readers
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, max_rows=10_000):
+        self.path = path
+        self.recent = deque(maxlen=max_rows)
+        self._columns = None
+
+    def publish(self, scored):
+        if len(scored) == 0:
+            return
+        if self.path is not None:
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            # Timestamps need more digits than the sensor readings
+            out = scored.assign(time=scored["time"].map("{:.3f}".format))
+            out.to_csv(self.path, mode="a", header=write_header, index=False, float_format="%.6g")
+        self._columns = list(scored.columns)
+        self.recent.extend(scored.itertuples(index=False, name=None))
+
+    def frame(self):
+        """The in-memory tail as a DataFrame"""
+        return pd.DataFrame(list(self.recent), columns=self._columns or STORE_COLUMNS)
+
+
+def read_store_tail(path, max_bytes=2 * 1024 * 1024):
+    """
+    Read the most recent rows of a monitoring store CSV without loading all of it
+
+    Returns:
+    - DataFrame of the rows in the last `max_bytes` of the file (empty if missing)
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame(columns=STORE_COLUMNS)
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        size = os.path.getsize(path)
+        start = max(fh.tell(), size - max_bytes)
+        fh.seek(start)
+        if start > len(header):
+            fh.readline()  # skip the partial line
+        body = fh.read()
+    columns = header.decode("utf-8").rstrip("\r\n").split(",")
+    if not body:
+        return pd.DataFrame(columns=columns)
+    return pd.read_csv(io.BytesIO(body), header=None, names=columns)
+
+
+class IngestGateway:
+    """
+    Bounded-queue, micro-batching scorer for streamed sensor snapshots
+
+    Parameters:
+    - model: Classifier with predict_proba (or a multi-output model with predict_all)
+    - feature_names: Feature order the model was trained with
+    - interval: Seconds per micro-batch
+    - max_batch: Most snapshots scored in one call
+    - queue_size: Snapshots buffered before the policy applies
+    - policy: "block", "drop_newest" or "drop_oldest"
+    - threshold: Probability cut-off for failure_pred
+    - sinks: Callables given each scored DataFrame (e.g. MonitoringStore.publish)
+    """
+
+    def __init__(self, model, feature_names, interval=0.1, max_batch=4096, queue_size=10_000,
+                 policy="block", threshold=0.5, sinks=()):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.interval = interval
+        self.max_batch = max_batch
+        self.policy = policy
+        self.threshold = threshold
+        self.sinks = list(sinks)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+        self.received = 0
+        self.malformed = 0
+        self.invalid = 0
+        self.dropped = 0
+        self.scored = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.sink_errors = 0
+        self.last_error = None
+        self.score_s = 0.0
+        self._servers = []
+        self._batcher = None
+
+    # Intake
+
+    def _offer(self, record):
+        """Queue one decoded snapshot without waiting, applying the drop policy"""
+        self.received += 1
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.policy == "drop_oldest":
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+
+    async def _enqueue(self, record):
+        """Queue one snapshot from a stream, waiting for room under the "block" policy"""
+        if self.policy == "block":
+            self.received += 1
+            await self.queue.put(record)
+        else:
+            self._offer(record)
+
+    def _decode(self, line):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            self.malformed += 1
+            return None
+        if not isinstance(record, dict):
+            self.malformed += 1
+            return None
+        return record
+
+    async def _handle_tcp(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    record = self._decode(line)
+                    if record is not None:
+                        await self._enqueue(record)
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _handle_datagram(self, data):
+        for line in data.splitlines():
+            if line.strip():
+                record = self._decode(line)
+                if record is not None:
+                    # UDP cannot push back, so "block" degrades to dropping new datagrams
+                    self._offer(record)
+
+    # Scoring
+
+    def score_batch(self, records):
+        """
+        Validate and score one micro-batch in a single model call
+
+        Returns:
+        - DataFrame in STORE_COLUMNS order (plus <mode>_prob for multi-output models)
+        """
+        batch, n_invalid = validate_batch(records)
+        self.invalid += n_invalid
+        if len(batch) == 0:
+            return batch
+
+        x = to_matrix(batch, self.feature_names)
+        mode_names = getattr(self.model, "mode_names", ())
+        if mode_names:
+            probs = self.model.predict_all(x)
+            batch["failure_prob"] = probs[:, 0]
+        else:
+            batch["failure_prob"] = self.model.predict_proba(x)[:, 1]
+        batch["failure_pred"] = (batch["failure_prob"] >= self.threshold).astype(int)
+        for j, mode in enumerate(mode_names, start=1):
+            batch[f"{mode}_prob"] = probs[:, j]
+        return batch[STORE_COLUMNS + [f"{mode}_prob" for mode in mode_names]]
+
+    def _drain(self):
+        records = []
+        while len(records) < self.max_batch:
+            try:
+                records.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return records
+
+    def _process(self, records):
+        """
+        Score one batch and hand it to every sink (runs in the executor)
+
+        Returns:
+        - Tuple of (scored frame, scoring seconds, list of sink error reprs)
+        """
+        t0 = time.perf_counter()
+        scored = self.score_batch(records)
+        score_s = time.perf_counter() - t0
+        errors = []
+        for sink in self.sinks:
+            try:
+                sink(scored)
+            except Exception as exc:  # a failing sink must not stop the others or the batcher
+                errors.append(repr(exc))
+        return scored, score_s, errors
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.interval
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            while True:
+                records = self._drain()
+                if not records:
+                    break
+                # Scoring and the (blocking) sinks run off the event loop so
+                # sockets keep being served
+                try:
+                    scored, score_s, sink_errors = await loop.run_in_executor(None, self._process, records)
+                except Exception as exc:  # keep the gateway alive; the batch is lost
+                    self.failed_batches += 1
+                    self.last_error = repr(exc)
+                else:
+                    self.score_s += score_s
+                    self.batches += 1
+                    self.scored += len(scored)
+                    self.sink_errors += len(sink_errors)
+                    if sink_errors:
+                        self.last_error = sink_errors[-1]
+                if len(records) < self.max_batch:
+                    break
+            # Do not try to catch up on ticks missed while scoring
+            next_tick = max(next_tick, loop.time())
+
+    # Lifecycle
+
+    async def start(self, host="127.0.0.1", tcp_port=None, udp_port=None, udp_buffer_bytes=4 * 1024 * 1024):
+        """
+        Start listeners and the batcher
+
+        A larger UDP receive buffer absorbs bursts while a batch is being
+        scored; datagrams that overflow it are lost before the gateway sees them.
+
+        Returns:
+        - Dict of protocol -> bound port (use port 0 for an ephemeral port)
+        """
+        loop = asyncio.get_running_loop()
+        ports = {}
+        if tcp_port is not None:
+            server = await asyncio.start_server(self._handle_tcp, host, tcp_port)
+            self._servers.append(server)
+            ports["tcp"] = server.sockets[0].getsockname()[1]
+        if udp_port is not None:
+            gateway = self
+
+            class _Datagrams(asyncio.DatagramProtocol):
+                def datagram_received(self, data, addr):
+                    gateway._handle_datagram(data)
+
+            transport, _ = await loop.create_datagram_endpoint(_Datagrams, local_addr=(host, udp_port))
+            transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, udp_buffer_bytes)
+            self._servers.append(transport)
+            ports["udp"] = transport.get_extra_info("sockname")[1]
+        self._batcher = asyncio.ensure_future(self._run_batcher())
+        return ports
+
+    async def flush(self, timeout=30.0):
+        """Wait until every queued snapshot has been scored"""
+        deadline = time.monotonic() + timeout
+        while not self.queue.empty() and time.monotonic() < deadline:
+            await asyncio.sleep(self.interval)
+        await asyncio.sleep(2 * self.interval)
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "malformed": self.malformed,
+            "invalid": self.invalid,
+            "dropped": self.dropped,
+            "scored": self.scored,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "sink_errors": self.sink_errors,
+            "queued": self.queue.qsize(),
+            "mean_batch_ms": self.score_s / self.batches * 1000 if self.batches else 0.0,
+        }
+
+
+async def serve(args):
+    model = joblib.load(args.model)
+    feature_names = joblib.load(FEATURE_NAMES_PATH)
+    store = MonitoringStore(args.store)
+    gateway = IngestGateway(
+        model,
+        feature_names,
+        interval=args.interval,
+        max_batch=args.max_batch,
+        queue_size=args.queue_size,
+        policy=args.policy,
+        sinks=[store.publish],
+    )
+    ports = await gateway.start(args.host, args.tcp_port, args.udp_port)
+    print(f"Gateway listening on {args.host} {ports}, publishing to {args.store}")
+    try:
+        while True:
+            await asyncio.sleep(args.report_every)
+            print(gateway.stats(), flush=True)
+    finally:
+        await gateway.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Line-delimited JSON sensor ingestion gateway")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--tcp-port", type=int, default=9009)
+    parser.add_argument("--udp-port", type=int, default=9010)
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds per micro-batch")
+    parser.add_argument("--max-batch", type=int, default=4096)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument("--policy", choices=POLICIES, default="block")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="Monitoring store CSV")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--report-every", type=float, default=10.0, help="Seconds between stats lines")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
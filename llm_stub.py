@@ -0,0 +1,213 @@
+"""
+Local stand-in for the Groq OpenAI-compatible endpoint
+
+Serves POST /v1/responses with a canned, deterministic reply so the report
+generators can be exercised end-to-end without network access or an API key.
+Optional fault injection returns 429/5xx errors or slow answers on demand.
+
+    python llm_stub.py --port 8765 --error-rate 0.2 --slow-rate 0.1
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+MACHINE_ID_PATTERN = re.compile(r"\b[LMH]\d{5}\b")
+
+
+def build_response(text, model):
+    """Wrap text in the JSON shape returned by the Responses API"""
+    now = int(time.time())
+    return {
+        "id": f"resp_stub_{now}",
+        "object": "response",
+        "created_at": now,
+        "model": model,
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_stub_{now}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def default_reply(prompt):
+    """One line per machine ID found in the prompt, otherwise a generic answer"""
+    machine_ids = MACHINE_ID_PATTERN.findall(prompt)
+    if machine_ids:
+        return "\n".join(
+            f"{mid} - elevated stress signals - inspect spindle and tooling this shift"
+            for mid in dict.fromkeys(machine_ids)
+        )
+    return (
+        "Machine condition looks stable. Keep monitoring torque, speed and tool wear, "
+        "and schedule the next inspection as planned."
+    )
+
+
+def random_faults(error_rate=0.0, statuses=(429, 500, 503), slow_rate=0.0, slow_seconds=2.0, seed=0):
+    """
+    Build a fault function for StubLLMServer
+
+    Parameters:
+    - error_rate: Fraction of requests answered with an error status
+    - statuses: Error statuses to pick from
+    - slow_rate: Fraction of requests delayed by slow_seconds
+    - slow_seconds: Extra latency for slow requests
+    - seed: Seed for reproducible fault sequences
+
+    Returns:
+    - Callable(request_index) -> None, an int status, or ("delay", seconds)
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def fault(request_index):
+        with lock:
+            roll = rng.random()
+            status = rng.choice(statuses)
+        if roll < error_rate:
+            return status
+        if roll < error_rate + slow_rate:
+            return ("delay", slow_seconds)
+        return None
+
+    return fault
+
+
+class StubLLMServer:
+    """
+    Threaded HTTP server that answers Responses API calls locally
+
+    Parameters:
+    - host: Interface to bind (default 127.0.0.1)
+    - port: Port to bind (0 = pick a free port)
+    - reply_fn: Callable(prompt) -> str producing the reply text
+    - latency: Seconds to sleep before answering each request
+    - fault_fn: Optional callable(request_index) -> None, an error status,
+      or ("delay", seconds); see random_faults
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, reply_fn=default_reply, latency=0.0, fault_fn=None):
+        self.reply_fn = reply_fn
+        self.latency = latency
+        self.fault_fn = fault_fn
+        self.requests = []
+        self.faults_injected = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, payload, headers=None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (e.g. its timeout fired first)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+
+                if not self.path.rstrip("/").endswith("/responses"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+
+                prompt = payload.get("input", "")
+                if not isinstance(prompt, str):
+                    prompt = json.dumps(prompt)
+                with server._lock:
+                    server.requests.append(prompt)
+                    request_index = len(server.requests) - 1
+
+                fault = server.fault_fn(request_index) if server.fault_fn else None
+                if isinstance(fault, int):
+                    with server._lock:
+                        server.faults_injected += 1
+                    headers = {"Retry-After": "1"} if fault == 429 else None
+                    self._send_json(
+                        fault, {"error": {"message": f"Injected fault {fault}"}}, headers
+                    )
+                    return
+                if fault is not None:
+                    with server._lock:
+                        server.faults_injected += 1
+                    time.sleep(fault[1])
+
+                if server.latency:
+                    time.sleep(server.latency)
+                text = server.reply_fn(prompt)
+                self._send_json(200, build_response(text, payload.get("model", "stub")))
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub for the Groq Responses API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    fault_fn = None
+    if args.error_rate or args.slow_rate:
+        fault_fn = random_faults(args.error_rate, slow_rate=args.slow_rate, slow_seconds=args.slow_seconds)
+    server = StubLLMServer(args.host, args.port, latency=args.latency, fault_fn=fault_fn)
+    print(f"Stub LLM listening on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Deterministic local maintenance report engine
+
+Builds the same style of report groq_maintenance_report asks the LLM for
+(condition, suspicious signals, 2-3 recommendations, plain English, under
+120 words) from rule templates keyed on torque, speed, tool wear and
+temperature-delta bands derived from the AI4I training data.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import xgboost
+
+from scoring import DATA_PATH, engineer_features
+
+
+BAND_QUANTILES = (0.05, 0.25, 0.75, 0.95)
+BAND_LABELS = ("very low", "low", "normal", "high", "very high")
+
+# A band is suspicious when its observed failure rate is this many times the base rate
+SUSPICIOUS_LIFT = 2.0
+
+# Below this confidence the app asks the LLM for an enhanced report
+LOW_CONFIDENCE = 0.6
+
+SIGNALS = {
+    "Torque_(Nm)": "torque",
+    "Rotational_speed_(rpm)": "rotational speed",
+    "Tool_wear_(min)": "tool wear",
+    "Temp_delta": "temperature delta",
+}
+
+# (feature, direction) -> (finding, recommendation)
+TEMPLATES = {
+    ("Torque_(Nm)", "high"): (
+        "torque is well above the normal range, pointing to mechanical overstrain",
+        "Check spindle load and cutting parameters, and reduce feed rate until torque settles.",
+    ),
+    ("Torque_(Nm)", "low"): (
+        "torque is unusually low, which can mean slipping or a loose drive",
+        "Inspect couplings, belts and tool clamping for slippage.",
+    ),
+    ("Rotational_speed_(rpm)", "high"): (
+        "rotational speed is running high",
+        "Verify the speed setpoint and check bearings and balance at high rpm.",
+    ),
+    ("Rotational_speed_(rpm)", "low"): (
+        "rotational speed is low, which limits cooling and raises power-failure risk",
+        "Confirm the drive is reaching its setpoint and inspect the motor and controller.",
+    ),
+    ("Tool_wear_(min)", "high"): (
+        "tool wear is near end of life",
+        "Schedule a tool change this shift before wear causes a breakage.",
+    ),
+    ("Temp_delta", "low"): (
+        "the process-to-air temperature gap is small, so heat is not being dissipated well",
+        "Clean filters and check coolant flow and fans to restore heat dissipation.",
+    ),
+    ("Temp_delta", "high"): (
+        "the process runs much hotter than ambient air",
+        "Inspect coolant supply and lubrication, and look for friction hot spots.",
+    ),
+}
+
+ROUTINE_RECOMMENDATIONS = (
+    "Keep the current maintenance schedule and log readings each shift.",
+    "Re-check torque, speed and tool wear if the machine load changes.",
+)
+
+
+def derive_bands(df):
+    """
+    Derive band edges and per-band failure rates from labelled data
+
+    Parameters:
+    - df: AI4I frame (raw or cleaned columns) with a "Machine failure" column
+
+    Returns:
+    - Dict with "base_rate" and, per signal, its "edges" and band "failure_rate"
+    """
+    features = engineer_features(df)
+    target = features["Machine failure"].to_numpy(dtype=np.float64)
+    base_rate = float(target.mean())
+
+    bands = {"base_rate": base_rate}
+    for fname in SIGNALS:
+        values = features[fname].to_numpy(dtype=np.float64)
+        edges = np.quantile(values, BAND_QUANTILES)
+        idx = np.searchsorted(edges, values, side="right")
+        counts = np.bincount(idx, minlength=len(BAND_LABELS))
+        failures = np.bincount(idx, weights=target, minlength=len(BAND_LABELS))
+        rates = np.divide(failures, counts, out=np.full(len(BAND_LABELS), base_rate), where=counts > 0)
+        bands[fname] = {"edges": edges, "failure_rate": rates}
+    return bands
+
+
+@lru_cache(maxsize=4)
+def load_bands(path=DATA_PATH):
+    """Bands for the training CSV, computed once per process"""
+    return derive_bands(pd.read_csv(path, encoding="utf-8-sig"))
+
+
+def feature_contributions(model, x_vec, feature_names):
+    """
+    Per-feature contributions to the failure log-odds (XGBoost's native SHAP)
+
+    Parameters:
+    - model: Fitted XGBClassifier
+    - x_vec: Input matrix of shape (1, n_features)
+    - feature_names: Feature order of x_vec
+
+    Returns:
+    - Dict of feature -> contribution (positive pushes towards failure)
+    """
+    dmatrix = xgboost.DMatrix(np.asarray(x_vec, dtype=np.float64), feature_names=list(feature_names))
+    contribs = model.get_booster().predict(dmatrix, pred_contribs=True)[0]
+    return {fname: float(c) for fname, c in zip(feature_names, contribs[:-1])}
+
+
+def classify_signals(features_dict, bands):
+    """
+    Place each signal in its band and flag the ones with elevated failure rates
+
+    Returns:
+    - List of dicts (feature, value, band, direction, lift), suspicious first
+    """
+    base_rate = bands["base_rate"]
+    out = []
+    for fname in SIGNALS:
+        value = float(features_dict[fname])
+        band_info = bands[fname]
+        idx = int(np.searchsorted(band_info["edges"], value, side="right"))
+        lift = float(band_info["failure_rate"][idx] / base_rate) if base_rate > 0 else 1.0
+        direction = "high" if idx > 2 else "low" if idx < 2 else "normal"
+        out.append({
+            "feature": fname,
+            "value": value,
+            "band": BAND_LABELS[idx],
+            "direction": direction,
+            "lift": lift,
+            "suspicious": direction != "normal" and lift >= SUSPICIOUS_LIFT,
+        })
+    return sorted(out, key=lambda s: (not s["suspicious"], -s["lift"]))
+
+
+def build_offline_report(features_dict, prediction, prob, contributions=None, bands=None):
+    """
+    Build a maintenance report locally, with no network call
+
+    Parameters:
+    - features_dict: The app's input_dict (feature -> value)
+    - prediction: Failure risk label (1 = high risk, 0 = low risk)
+    - prob: Failure probability
+    - contributions: Optional output of feature_contributions to rank signals
+    - bands: Band table from derive_bands (defaults to the training data)
+
+    Returns:
+    - Dict with "text", "confidence" (0-1), "low_confidence" and "signals"
+    """
+    bands = bands if bands is not None else load_bands()
+    signals = classify_signals(features_dict, bands)
+
+    suspicious = [s for s in signals if s["suspicious"]]
+    if contributions:
+        # Order by how hard the model itself leaned on each signal
+        suspicious.sort(key=lambda s: -contributions.get(s["feature"], 0.0))
+        model_drivers = [
+            f for f, c in sorted(contributions.items(), key=lambda kv: -kv[1])
+            if f in SIGNALS and c > 0
+        ]
+    else:
+        model_drivers = [s["feature"] for s in suspicious]
+
+    if prediction == 1:
+        condition = f"The machine is at high risk of failure ({prob:.0%} probability)."
+    elif prob >= 0.3:
+        condition = f"The machine is running but shows early warning signs ({prob:.0%} failure probability)."
+    else:
+        condition = f"The machine is in good condition ({prob:.0%} failure probability)."
+
+    findings = [TEMPLATES[(s["feature"], s["direction"])] for s in suspicious[:3]
+                if (s["feature"], s["direction"]) in TEMPLATES]
+    if findings:
+        detail = " ".join(f"{finding[0][0].upper()}{finding[0][1:]}." for finding in findings)
+        recommendations = [finding[1] for finding in findings]
+    elif prediction == 1 and model_drivers:
+        names = ", ".join(SIGNALS[f] for f in model_drivers[:2])
+        detail = f"No single signal is out of range, but the combination of {names} drives the risk."
+        recommendations = [f"Inspect the machine with focus on {names}."]
+    else:
+        detail = "Torque, speed, tool wear and temperature delta are all within their normal bands."
+        recommendations = []
+
+    for routine in ROUTINE_RECOMMENDATIONS:
+        if len(recommendations) >= 3:
+            break
+        if len(recommendations) < 2 or prediction == 0:
+            recommendations.append(routine)
+    recommendations = recommendations[:3]
+
+    text = " ".join([condition, detail, "Recommendations:"] +
+                    [f"{i}) {rec}" for i, rec in enumerate(recommendations, 1)])
+
+    # Confident when the model is decisive and the rules agree with it
+    margin = min(1.0, abs(prob - 0.5) * 2)
+    if prediction == 1:
+        agreement = 1.0 if suspicious else 0.0
+    else:
+        agreement = 1.0 if not suspicious else 0.5 if len(suspicious) == 1 else 0.0
+    confidence = 0.5 * margin + 0.5 * agreement
+
+    return {
+        "text": text,
+        "confidence": confidence,
+        "low_confidence": confidence < LOW_CONFIDENCE,
+        "signals": signals,
+    }
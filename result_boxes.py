@@ -84,6 +84,32 @@ def create_metric_cards(prob, pred):
     return card1, card2, card3
 
 
+def create_mode_cards(mode_probs):
+    """
+    Create one metric card per failure mode, most likely mode first
+    
+    Parameters:
+    - mode_probs: Dict of mode label (e.g. "HDF") -> probability (0-1)
+    
+    Returns:
+    - List of HTML strings, one per mode
+    """
+    cards = []
+    for mode, prob in sorted(mode_probs.items(), key=lambda kv: -kv[1]):
+        if prob >= 0.5:
+            box_type = "danger"
+        elif prob >= 0.2:
+            box_type = "warning"
+        else:
+            box_type = "success"
+        cards.append(create_result_box(
+            value=f"{prob*100:.1f}%",
+            label=f"{mode} Risk",
+            box_type=box_type
+        ))
+    return cards
+
+
 def create_report_box(text):
     """
     Create a styled report box for AI recommendations
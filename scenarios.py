@@ -0,0 +1,117 @@
+"""
+Seeded, vectorized scenario trajectories for the live monitor
+
+Each generator produces a whole n_steps run of simulated sensor readings in
+one call from a seed, so a run is reproducible and can be scored in a single
+batch before the UI starts animating it.
+"""
+import numpy as np
+import pandas as pd
+
+from scoring import predict_failure_proba
+
+
+SCENARIOS = ("Normal operation", "Increasing load", "High stress", "Random fluctuation")
+
+# Base operating points
+BASE_AIR = 295.0
+BASE_SPEED = 1200.0
+BASE_TORQUE = 30.0
+
+MAX_WEAR = 300.0
+
+LIVE_COLUMNS = [
+    "time", "Air_temperature_(K)", "Process_temperature_(K)",
+    "Rotational_speed_(rpm)", "Torque_(Nm)", "Tool_wear_(min)",
+    "Temp_delta", "Power_est", "failure_prob",
+]
+
+
+def _load_normal(rng, n_steps, start_load):
+    return start_load + np.cumsum(rng.normal(0.0, 0.03, n_steps))
+
+
+def _load_increasing(rng, n_steps, start_load):
+    return start_load + np.cumsum(0.01 + rng.normal(0.0, 0.02, n_steps))
+
+
+def _load_high_stress(rng, n_steps, start_load):
+    return rng.uniform(0.7, 1.0, n_steps)
+
+
+def _load_random(rng, n_steps, start_load):
+    return rng.uniform(0.0, 1.0, n_steps)
+
+
+LOAD_GENERATORS = {
+    "Normal operation": _load_normal,
+    "Increasing load": _load_increasing,
+    "High stress": _load_high_stress,
+    "Random fluctuation": _load_random,
+}
+
+
+def generate_trajectory(scenario, n_steps, seed=None, start_load=0.3, start_wear=50.0):
+    """
+    Generate a full run of simulated sensor readings
+
+    Load random walks are accumulated and then clipped to [0, 1] (rather than
+    clipped at every step) so the whole run is a handful of array operations.
+
+    Parameters:
+    - scenario: One of SCENARIOS
+    - n_steps: Number of time steps
+    - seed: Seed for numpy's Generator (None = fresh entropy)
+    - start_load: Load level the run continues from (0-1)
+    - start_wear: Tool wear (min) the run continues from
+
+    Returns:
+    - DataFrame with one row per step: load plus every model feature
+    """
+    if scenario not in LOAD_GENERATORS:
+        raise ValueError(f"Unknown scenario {scenario!r}; expected one of {SCENARIOS}")
+
+    rng = np.random.default_rng(seed)
+    n_steps = int(n_steps)
+
+    load = np.clip(LOAD_GENERATORS[scenario](rng, n_steps, start_load), 0.0, 1.0)
+    wear = np.clip(start_wear + np.cumsum(rng.uniform(0.2, 0.8, n_steps)), 0.0, MAX_WEAR)
+
+    # Simulated sensors (correlated with load)
+    air_temp = rng.normal(BASE_AIR, 1.5, n_steps)
+    process_temp = air_temp + 5 + 20 * load + rng.normal(0.0, 0.7, n_steps)
+    rotational_speed = BASE_SPEED + 1000 * load + rng.normal(0.0, 80, n_steps)
+    torque = BASE_TORQUE + 45 * load + rng.normal(0.0, 5, n_steps)
+
+    return pd.DataFrame({
+        "load": load,
+        "Air_temperature_(K)": air_temp,
+        "Process_temperature_(K)": process_temp,
+        "Rotational_speed_(rpm)": rotational_speed,
+        "Torque_(Nm)": torque,
+        "Tool_wear_(min)": wear,
+        "Temp_delta": process_temp - air_temp,
+        "Power_est": torque * rotational_speed,
+        "Type_L": np.zeros(n_steps),
+        "Type_M": np.zeros(n_steps),
+    })
+
+
+def simulate_run(model, feature_names, scenario, n_steps, seed=None, start_load=0.3,
+                 start_wear=50.0, start_time=1):
+    """
+    Generate a trajectory and score every step in one batch
+
+    Parameters:
+    - model: Fitted classifier with predict_proba
+    - feature_names: Feature order the model was trained with
+    - scenario, n_steps, seed, start_load, start_wear: See generate_trajectory
+    - start_time: Time index of the first step
+
+    Returns:
+    - DataFrame with LIVE_COLUMNS plus "load"
+    """
+    run = generate_trajectory(scenario, n_steps, seed, start_load, start_wear)
+    run["failure_prob"] = predict_failure_proba(model, run, feature_names)
+    run["time"] = np.arange(start_time, start_time + len(run))
+    return run[LIVE_COLUMNS + ["load"]]
@@ -0,0 +1,163 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "data", "ai4i2020.csv")
+# XGB_MODEL_PATH deploys another artifact (e.g. the output of tuning.py)
+MODEL_PATH = os.getenv("XGB_MODEL_PATH", os.path.join(BASE_DIR, "xgb_model.pkl"))
+SCALER_PATH = os.path.join(BASE_DIR, "scaler.pkl")
+FEATURE_NAMES_PATH = os.path.join(BASE_DIR, "feature_names.pkl")
+
+# Raw AI4I column name -> cleaned name used by the notebook and the model
+RAW_TO_MODEL_COLUMNS = {
+    "Air temperature [K]": "Air_temperature_(K)",
+    "Process temperature [K]": "Process_temperature_(K)",
+    "Rotational speed [rpm]": "Rotational_speed_(rpm)",
+    "Torque [Nm]": "Torque_(Nm)",
+    "Tool wear [min]": "Tool_wear_(min)",
+}
+
+SENSOR_COLUMNS = list(RAW_TO_MODEL_COLUMNS.values())
+
+TARGET_COLUMN = "Machine failure"
+
+# AI4I failure-mode labels (the notebook drops these from the binary model)
+FAILURE_MODES = {
+    "TWF": "tool wear failure",
+    "HDF": "heat dissipation failure",
+    "PWF": "power failure",
+    "OSF": "overstrain failure",
+    "RNF": "random failure",
+}
+
+
+def load_artifacts(base_dir=BASE_DIR, model_path=MODEL_PATH):
+    """
+    Load the trained model, scaler and feature order from disk
+
+    Parameters:
+    - base_dir: Directory holding scaler.pkl and feature_names.pkl
+    - model_path: Pickled XGBoost model (defaults to xgb_model.pkl or $XGB_MODEL_PATH)
+
+    Returns:
+    - Tuple of (xgb_model, scaler, feature_names)
+    """
+    xgb = joblib.load(model_path)
+    scaler = joblib.load(os.path.join(base_dir, "scaler.pkl"))
+    feature_names = joblib.load(os.path.join(base_dir, "feature_names.pkl"))
+    return xgb, scaler, feature_names
+
+
+def engineer_features(df):
+    """
+    Build the model features from a sensor frame
+
+    Accepts either the raw AI4I column names ("Torque [Nm]", ...) or the
+    cleaned names the app uses ("Torque_(Nm)", ...). Derived features and
+    the Type dummies are added the same way the notebook does it.
+
+    Parameters:
+    - df: DataFrame of sensor readings (optionally with a "Type" column)
+
+    Returns:
+    - New DataFrame with every model feature column present
+    """
+    out = df.rename(columns=RAW_TO_MODEL_COLUMNS)
+
+    if "Temp_delta" not in out.columns:
+        out["Temp_delta"] = out["Process_temperature_(K)"] - out["Air_temperature_(K)"]
+    if "Power_est" not in out.columns:
+        out["Power_est"] = out["Torque_(Nm)"] * out["Rotational_speed_(rpm)"]
+
+    # Type H is the dropped baseline of get_dummies(drop_first=True)
+    if "Type" in out.columns:
+        machine_type = out["Type"].astype(str)
+        if "Type_L" not in out.columns:
+            out["Type_L"] = (machine_type == "L").astype(np.float64)
+        if "Type_M" not in out.columns:
+            out["Type_M"] = (machine_type == "M").astype(np.float64)
+
+    return out
+
+
+def to_matrix(df, feature_names):
+    """
+    Convert a feature frame to the model's input matrix
+
+    Missing features default to 0.0, matching how the app builds x_vec.
+
+    Parameters:
+    - df: DataFrame returned by engineer_features (or the app's input rows)
+    - feature_names: Feature order the model was trained with
+
+    Returns:
+    - float64 numpy array of shape (n_rows, n_features)
+    """
+    x = np.zeros((len(df), len(feature_names)), dtype=np.float64)
+    for j, fname in enumerate(feature_names):
+        if fname in df.columns:
+            x[:, j] = df[fname].to_numpy(dtype=np.float64)
+    return x
+
+
+def predict_failure_proba(model, df, feature_names):
+    """
+    Score a sensor frame in one vectorized call
+
+    Parameters:
+    - model: Fitted classifier with predict_proba
+    - df: DataFrame of sensor readings (raw or cleaned column names)
+    - feature_names: Feature order the model was trained with
+
+    Returns:
+    - numpy array of failure probabilities, one per row
+    """
+    x = to_matrix(engineer_features(df), feature_names)
+    if len(x) == 0:
+        return np.empty(0, dtype=np.float64)
+    return model.predict_proba(x)[:, 1]
+
+
+def predict_failure_modes(model, df, feature_names):
+    """
+    Score overall risk and every failure mode in one vectorized call
+
+    Parameters:
+    - model: Multi-output model with predict_all (see failure_modes.py)
+    - df: DataFrame of sensor readings (raw or cleaned column names)
+    - feature_names: Feature order the model was trained with
+
+    Returns:
+    - numpy array of shape (n_rows, len(model.outputs)), one probability per output
+    """
+    x = to_matrix(engineer_features(df), feature_names)
+    if len(x) == 0:
+        return np.empty((0, len(model.outputs)), dtype=np.float64)
+    return model.predict_all(x)
+
+
+def load_training_data(path=DATA_PATH, feature_names=None):
+    """
+    Load the AI4I CSV as the notebook does (features X, labels y)
+
+    Parameters:
+    - path: AI4I CSV path
+    - feature_names: Column order for X (defaults to feature_names.pkl)
+
+    Returns:
+    - Tuple of (X DataFrame, y Series, full engineered DataFrame)
+    """
+    if feature_names is None:
+        feature_names = joblib.load(FEATURE_NAMES_PATH)
+    df = engineer_features(pd.read_csv(path, encoding="utf-8-sig"))
+    return df[list(feature_names)].astype(np.float64), df[TARGET_COLUMN].astype(int), df
+
+
+def notebook_split(X, y, test_size=0.2, random_state=42):
+    """The notebook's stratified 80/20 split, so held-out metrics are comparable"""
+    return train_test_split(X, y, test_size=test_size, stratify=y, random_state=random_state)
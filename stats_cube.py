@@ -0,0 +1,355 @@
+"""
+Precomputed statistics cube for grounding RiskBot answers
+
+Counts and label sums are aggregated once into a dense numpy cube over
+machine Type x tool wear x torque x rotational speed bins. Any slice query
+("type L with tool wear over 200") is then a sum over a sub-array, which
+takes microseconds and never re-reads the CSV. Monitoring history is added
+to a second cube incrementally as the live monitor produces rows.
+
+    python stats_cube.py "What's the failure rate for type L with tool wear over 200?"
+"""
+import re
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from scoring import DATA_PATH, FAILURE_MODES, TARGET_COLUMN, engineer_features
+
+
+TYPES = ("L", "M", "H")
+
+# Inner bin edges per numeric dimension; the first and last bins are open-ended
+BIN_EDGES = {
+    "Tool_wear_(min)": np.arange(10.0, 260.0, 10.0),
+    "Torque_(Nm)": np.arange(10.0, 80.0, 5.0),
+    "Rotational_speed_(rpm)": np.arange(1200.0, 2900.0, 100.0),
+}
+
+DIMENSION_LABELS = {
+    "Tool_wear_(min)": ("tool wear", "min"),
+    "Torque_(Nm)": ("torque", "Nm"),
+    "Rotational_speed_(rpm)": ("rotational speed", "rpm"),
+}
+
+DATASET_TARGETS = (TARGET_COLUMN,) + tuple(FAILURE_MODES)
+
+# Bins with fewer rows than this are left out of "riskiest band" summaries
+MIN_SUPPORT = 30
+
+
+class StatsCube:
+    """
+    Dense count/sum cube over Type and binned wear, torque and speed
+
+    Parameters:
+    - targets: Columns summed per cell (0/1 labels give failure rates,
+      probabilities give mean predicted risk)
+    """
+
+    def __init__(self, targets=DATASET_TARGETS):
+        self.targets = tuple(targets)
+        self.shape = (len(TYPES),) + tuple(len(e) + 1 for e in BIN_EDGES.values())
+        self.counts = np.zeros(self.shape, dtype=np.int64)
+        self.sums = np.zeros((len(self.targets),) + self.shape, dtype=np.float64)
+
+    @property
+    def n_rows(self):
+        return int(self.counts.sum())
+
+    def add(self, df):
+        """
+        Fold rows into the cube
+
+        Parameters:
+        - df: Sensor frame (raw or cleaned columns, with "Type" or the Type
+          dummies) holding every column in `targets`
+        """
+        if len(df) == 0:
+            return
+        features = engineer_features(df)
+        if "Type" in features.columns:
+            type_idx = features["Type"].astype(str).map({t: i for i, t in enumerate(TYPES)})
+            type_idx = type_idx.fillna(TYPES.index("H")).to_numpy(dtype=np.int64)
+        else:
+            # Type H is the dropped dummy baseline
+            type_l = features.get("Type_L", pd.Series(0.0, index=features.index)).to_numpy()
+            type_m = features.get("Type_M", pd.Series(0.0, index=features.index)).to_numpy()
+            type_idx = np.where(type_l == 1, 0, np.where(type_m == 1, 1, 2))
+
+        coords = [type_idx] + [
+            np.searchsorted(edges, features[dim].to_numpy(dtype=np.float64), side="right")
+            for dim, edges in BIN_EDGES.items()
+        ]
+        flat = np.ravel_multi_index(coords, self.shape)
+        size = self.counts.size
+
+        self.counts += np.bincount(flat, minlength=size).reshape(self.shape)
+        for k, target in enumerate(self.targets):
+            weights = features[target].to_numpy(dtype=np.float64)
+            self.sums[k] += np.bincount(flat, weights=weights, minlength=size).reshape(self.shape)
+
+    def _selection(self, filters):
+        """Translate filters into one slice per axis, plus the bin-aligned ranges covered"""
+        selection = [slice(None)]
+        covered = {}
+        machine_type = filters.get("Type")
+        if machine_type is not None:
+            i = TYPES.index(machine_type)
+            selection[0] = slice(i, i + 1)
+
+        for dim, edges in BIN_EDGES.items():
+            lo, hi = filters.get(dim, (-np.inf, np.inf))
+            start = int(np.searchsorted(edges, lo, side="right"))
+            stop = int(np.searchsorted(edges, hi, side="left")) + 1
+            selection.append(slice(start, stop))
+            if dim in filters:
+                bounds = np.concatenate([[-np.inf], edges, [np.inf]])
+                covered[dim] = (float(bounds[start]), float(bounds[stop]))
+        return tuple(selection), covered
+
+    def query(self, filters=None):
+        """
+        Aggregate one slice of the cube
+
+        Parameters:
+        - filters: Dict with optional "Type" ("L"/"M"/"H") and, per numeric
+          dimension, a (low, high) range; ranges snap outward to bin edges
+
+        Returns:
+        - Dict with "count", per-target "rates" and the "ranges" actually covered
+        """
+        selection, covered = self._selection(filters or {})
+        count = int(self.counts[selection].sum())
+        totals = self.sums[(slice(None),) + selection].reshape(len(self.targets), -1).sum(axis=1)
+        rates = {t: (float(s / count) if count else None) for t, s in zip(self.targets, totals)}
+        return {"count": count, "rates": rates, "ranges": covered}
+
+    def riskiest_band(self, dim, target=TARGET_COLUMN, min_support=MIN_SUPPORT):
+        """
+        The bin of `dim` with the highest rate of `target` (marginal over the other axes)
+
+        Returns:
+        - Tuple of ((low, high), rate, count), or None if no bin has enough rows
+        """
+        axis = 1 + list(BIN_EDGES).index(dim)
+        other = tuple(a for a in range(len(self.shape)) if a != axis)
+        counts = self.counts.sum(axis=other)
+        sums = self.sums[self.targets.index(target)].sum(axis=other)
+        valid = counts >= min_support
+        if not valid.any():
+            return None
+        rates = np.where(valid, sums / np.maximum(counts, 1), -1.0)
+        i = int(np.argmax(rates))
+        bounds = np.concatenate([[-np.inf], BIN_EDGES[dim], [np.inf]])
+        return (float(bounds[i]), float(bounds[i + 1])), float(rates[i]), int(counts[i])
+
+
+@lru_cache(maxsize=4)
+def load_cube(path=DATA_PATH):
+    """Cube over the training CSV, built once per process"""
+    cube = StatsCube()
+    cube.add(pd.read_csv(path, encoding="utf-8-sig"))
+    return cube
+
+
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_DIMENSION_WORDS = {
+    "Tool_wear_(min)": r"(?:tool\s*)?wear",
+    "Torque_(Nm)": r"torque",
+    "Rotational_speed_(rpm)": r"(?:rotational\s*)?speed|rpm",
+}
+_ABOVE = r"(?:over|above|more than|greater than|higher than|at least|>=?)"
+_BELOW = r"(?:under|below|less than|lower than|at most|<=?)"
+_MODE_WORDS = {
+    "TWF": r"\btwf\b|tool wear failure",
+    "HDF": r"\bhdf\b|heat dissipation",
+    "PWF": r"\bpwf\b|power failure",
+    "OSF": r"\bosf\b|overstrain",
+    "RNF": r"\brnf\b|random failure",
+}
+
+
+_DIMENSION_PATTERN = re.compile(
+    "|".join(f"(?P<d{i}>{words})" for i, words in enumerate(_DIMENSION_WORDS.values()))
+)
+_SENTENCE_END = re.compile(r"[;?!]|\.(?!\d)")
+
+
+def _dimension_clauses(text):
+    """
+    Split text into the words following each dimension keyword
+
+    A clause runs from a dimension keyword to the next keyword of a different
+    dimension or the end of the sentence, so "wear over 200 and torque below
+    40" gives wear "over 200 and" and torque "below 40".
+
+    Returns:
+    - Dict of dimension -> clause text (clauses of a repeated dimension are joined)
+    """
+    dims = list(_DIMENSION_WORDS)
+    hits = [(m.start(), m.end(), dims[int(m.lastgroup[1:])]) for m in _DIMENSION_PATTERN.finditer(text)]
+    clauses = {}
+    for k, (_, end, dim) in enumerate(hits):
+        stop = next((start for start, _, other in hits[k + 1:] if other != dim), len(text))
+        clause = _SENTENCE_END.split(text[end:stop], maxsplit=1)[0]
+        clauses[dim] = clauses.get(dim, "") + " " + clause
+    return clauses
+
+
+def parse_question(question):
+    """
+    Pull slice filters and failure modes out of a free-text question
+
+    Understands "type L", "L-type", "<dimension> over/under N" and
+    "<dimension> between A and B" for tool wear, torque and speed.
+
+    Returns:
+    - Tuple of (filters dict for StatsCube.query, list of failure-mode columns)
+    """
+    text = question.lower()
+    filters = {}
+
+    match = re.search(r"\btype\s*([lmh])\b|\b([lmh])[\s-]type\b", text)
+    if match:
+        filters["Type"] = (match.group(1) or match.group(2)).upper()
+
+    for dim, clause in _dimension_clauses(text).items():
+        between = re.search(rf"between\s*{_NUMBER}\s*(?:and|-)\s*{_NUMBER}", clause)
+        above = re.search(rf"{_ABOVE}\s*{_NUMBER}", clause)
+        below = re.search(rf"{_BELOW}\s*{_NUMBER}", clause)
+        if between:
+            lo, hi = sorted((float(between.group(1)), float(between.group(2))))
+        elif above or below:
+            lo = float(above.group(1)) if above else -np.inf
+            hi = float(below.group(1)) if below else np.inf
+        else:
+            continue
+        # A contradictory range ("over 200 and under 100") is ignored rather than
+        # reported as an empty slice
+        if lo < hi:
+            filters[dim] = (lo, hi)
+
+    modes = [mode for mode, words in _MODE_WORDS.items() if re.search(words, text)]
+    return filters, modes
+
+
+def _describe_range(dim, lo, hi):
+    name, unit = DIMENSION_LABELS[dim]
+    if np.isinf(lo):
+        return f"{name} < {hi:g} {unit}"
+    if np.isinf(hi):
+        return f"{name} >= {lo:g} {unit}"
+    return f"{name} {lo:g}-{hi:g} {unit}"
+
+
+def describe_slice(cube, filters, modes=()):
+    """One line of text for a dataset slice (count, failure rate, lift, modes)"""
+    result = cube.query(filters)
+    parts = []
+    if "Type" in filters:
+        parts.append(f"Type {filters['Type']}")
+    parts += [_describe_range(dim, lo, hi) for dim, (lo, hi) in result["ranges"].items()]
+    label = ", ".join(parts) or "all machines"
+
+    if result["count"] == 0:
+        return f"{label}: no rows in the dataset"
+
+    rate = result["rates"][TARGET_COLUMN]
+    base = cube.query()["rates"][TARGET_COLUMN]
+    lift = f", {rate / base:.1f}x the overall rate" if base else ""
+    line = f"{label}: {result['count']} rows, failure rate {rate:.1%}{lift}"
+
+    shown = [m for m in (modes or FAILURE_MODES) if m in result["rates"]]
+    mode_rates = [f"{m} {result['rates'][m]:.1%}" for m in shown if modes or result["rates"][m] > 0]
+    if mode_rates:
+        line += " (" + ", ".join(mode_rates) + ")"
+    return line
+
+
+def build_chat_context(question, cube=None, history_cube=None):
+    """
+    Data-backed context for the RiskBot prompt
+
+    Always includes the dataset overview and the riskiest band per dimension;
+    adds the slice the question asks about and, when present, the live
+    monitoring history for the same slice.
+
+    Parameters:
+    - question: The user's question
+    - cube: Dataset cube (defaults to the training CSV)
+    - history_cube: Optional StatsCube over monitoring history (targets=("failure_prob",))
+
+    Returns:
+    - Multi-line string of statistics
+    """
+    cube = cube if cube is not None else load_cube()
+    filters, modes = parse_question(question)
+
+    overall = cube.query()
+    by_type = [(t, cube.query({"Type": t})) for t in TYPES]
+    lines = [
+        f"AI4I 2020 dataset: {overall['count']} rows, overall failure rate "
+        f"{overall['rates'][TARGET_COLUMN]:.1%}.",
+        "By type: " + ", ".join(
+            f"{t} {r['rates'][TARGET_COLUMN]:.1%} of {r['count']} rows" for t, r in by_type if r["count"]
+        ) + ".",
+        "By failure mode: " + ", ".join(
+            f"{name} ({mode}) {overall['rates'][mode]:.2%}" for mode, name in FAILURE_MODES.items()
+        ) + ".",
+    ]
+
+    riskiest = []
+    for dim in BIN_EDGES:
+        band = cube.riskiest_band(dim)
+        if band is not None:
+            (lo, hi), rate, count = band
+            riskiest.append(f"{_describe_range(dim, lo, hi)} ({rate:.1%} of {count} rows)")
+    if riskiest:
+        lines.append("Riskiest bands: " + "; ".join(riskiest) + ".")
+
+    if filters or modes:
+        lines.append("Slice asked about: " + describe_slice(cube, filters, modes) + ".")
+
+    if history_cube is not None and history_cube.n_rows > 0:
+        live = history_cube.query(filters)
+        if live["count"]:
+            lines.append(
+                f"Live monitoring history (same slice): {live['count']} readings, "
+                f"mean predicted failure probability {live['rates']['failure_prob']:.1%}."
+            )
+        else:
+            lines.append(f"Live monitoring history: {history_cube.n_rows} readings, none in this slice.")
+
+    return "\n".join(lines)
+
+
+def main():
+    question = " ".join(sys.argv[1:]) or "What's the failure rate for type L with tool wear over 200?"
+
+    t0 = time.perf_counter()
+    cube = load_cube()
+    build_s = time.perf_counter() - t0
+
+    filters, _ = parse_question(question)
+    repeats = 1000
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        cube.query(filters)
+    query_s = (time.perf_counter() - t0) / repeats
+
+    t0 = time.perf_counter()
+    context = build_chat_context(question, cube)
+    context_s = time.perf_counter() - t0
+
+    print(context)
+    print()
+    print(f"Cube built in {build_s * 1000:.1f} ms ({cube.n_rows} rows, {cube.counts.size} cells); "
+          f"slice query {query_s * 1e6:.0f} µs; full prompt context {context_s * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+from openai import OpenAI
+
+from fleet_report import generate_fleet_report, pack_prompts
+from groq_client import DEGRADED_RESPONSE, ResilientLLMClient
+from llm_stub import StubLLMServer, random_faults
+from scoring import DATA_PATH, load_artifacts
+
+
+@pytest.fixture(scope="module")
+def fleet():
+    xgb, _, feature_names = load_artifacts()
+    df = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
+    return df, xgb, feature_names
+
+
+def make_client(stub):
+    return ResilientLLMClient(
+        OpenAI(api_key="stub", base_url=stub.base_url),
+        requests_per_minute=6000,
+        tokens_per_minute=None,
+        max_retries=0,
+        failure_threshold=100,
+    )
+
+
+def offender_ids(result, top_n):
+    ranked = result["ranked"]
+    return list(ranked[ranked["failure_prob"] >= 0.5].head(top_n)["Product ID"])
+
+
+def test_pack_prompts_keeps_batches_in_order():
+    lines = [f"L{i:05d} p=0.9" for i in range(40)]
+    packed = pack_prompts(lines, token_budget=200)
+    assert len(packed) > 1
+    assert [line for _, batch in packed for line in batch] == lines
+    for prompt, batch in packed:
+        assert all(line in prompt for line in batch)
+
+
+def test_report_against_stub(fleet):
+    df, xgb, feature_names = fleet
+    with StubLLMServer() as stub:
+        result = generate_fleet_report(
+            df, make_client(stub).complete, xgb, feature_names, top_n=25, token_budget=400
+        )
+        assert len(stub.requests) == result["n_prompts"] > 1
+
+    ids = offender_ids(result, 25)
+    assert len(ids) == 25
+    for machine_id in ids:
+        assert f"{machine_id} - elevated stress signals" in result["report"]
+
+
+def test_report_keeps_every_offender_when_llm_fails(fleet):
+    df, xgb, feature_names = fleet
+    with StubLLMServer(fault_fn=random_faults(error_rate=1.0, statuses=(500,))) as stub:
+        result = generate_fleet_report(
+            df, make_client(stub).complete, xgb, feature_names, top_n=25, token_budget=400
+        )
+
+    report = result["report"]
+    assert DEGRADED_RESPONSE not in report
+    for machine_id in offender_ids(result, 25):
+        assert f"{machine_id} p=" in report
@@ -0,0 +1,150 @@
+import time
+
+import pytest
+from openai import OpenAI
+
+from groq_client import DEGRADED_RESPONSE, CircuitBreaker, ResilientLLMClient
+from llm_stub import StubLLMServer, default_reply, random_faults
+
+
+PROMPT = "status check"
+
+
+@pytest.fixture
+def stub():
+    with StubLLMServer() as server:
+        yield server
+
+
+def make_client(stub, **kwargs):
+    options = dict(
+        requests_per_minute=6000,
+        tokens_per_minute=None,
+        timeout=2.0,
+        max_retries=3,
+        backoff_base=0.01,
+        backoff_max=0.05,
+        failure_threshold=2,
+        reset_timeout=0.3,
+    )
+    options.update(kwargs)
+    return ResilientLLMClient(OpenAI(api_key="stub", base_url=stub.base_url), **options)
+
+
+def test_retries_through_transient_faults(stub):
+    stub.fault_fn = random_faults(error_rate=0.5, statuses=(500, 503), seed=3)
+    llm = make_client(stub, max_retries=6, failure_threshold=100)
+
+    answers = [llm.complete(f"{PROMPT} {i}") for i in range(10)]
+
+    stats = llm.stats()
+    assert answers == [default_reply(PROMPT)] * 10
+    assert stub.faults_injected > 0
+    assert stats["retries"] == stub.faults_injected
+    assert stats["server_errors"] == stub.faults_injected
+    assert stats["degraded"] == 0
+    assert stats["circuit_state"] == CircuitBreaker.CLOSED
+
+
+def test_breaker_opens_half_opens_and_closes(stub):
+    stub.fault_fn = random_faults(error_rate=1.0, statuses=(503,))
+    llm = make_client(stub, max_retries=0)
+
+    assert llm.complete(PROMPT) == DEGRADED_RESPONSE
+    assert llm.breaker.state == CircuitBreaker.CLOSED
+    assert llm.complete(PROMPT) == DEGRADED_RESPONSE
+    assert llm.breaker.state == CircuitBreaker.OPEN
+
+    # Open: fails fast without touching upstream
+    upstream = len(stub.requests)
+    assert llm.complete(PROMPT) == DEGRADED_RESPONSE
+    assert len(stub.requests) == upstream
+    assert llm.stats()["short_circuited"] == 1
+
+    # Half-open probe fails: straight back to open
+    time.sleep(0.35)
+    assert llm.complete(PROMPT) == DEGRADED_RESPONSE
+    assert len(stub.requests) == upstream + 1
+    assert llm.breaker.state == CircuitBreaker.OPEN
+
+    # Upstream recovers: the next probe closes the circuit
+    stub.fault_fn = random_faults(error_rate=0.0)
+    time.sleep(0.35)
+    assert llm.complete(PROMPT) == default_reply(PROMPT)
+    assert llm.breaker.state == CircuitBreaker.CLOSED
+    assert llm.complete(PROMPT) == default_reply(PROMPT)
+
+
+def test_degrades_to_fallback(stub):
+    stub.fault_fn = random_faults(error_rate=1.0, statuses=(500,))
+    llm = make_client(stub, max_retries=1)
+
+    answer = llm.complete(PROMPT, fallback=lambda prompt: f"local answer for {prompt}")
+
+    assert answer == f"local answer for {PROMPT}"
+    assert len(stub.requests) == 2
+    assert llm.stats()["degraded"] == 1
+
+
+def test_client_errors_are_not_retried(stub):
+    stub.fault_fn = random_faults(error_rate=1.0, statuses=(400,))
+    llm = make_client(stub)
+
+    assert llm.complete(PROMPT) == DEGRADED_RESPONSE
+    assert len(stub.requests) == 1
+    assert llm.stats()["other_errors"] == 1
+    assert llm.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_deadline_caps_a_slow_attempt(stub):
+    stub.latency = 1.0
+    llm = make_client(stub, timeout=5.0)
+
+    t0 = time.monotonic()
+    answer = llm.complete(PROMPT, deadline=0.3)
+    elapsed = time.monotonic() - t0
+
+    assert answer == DEGRADED_RESPONSE
+    assert elapsed < 0.9
+    assert llm.stats()["deadline_exceeded"] == 1
+    # Our own deadline is not evidence of an unhealthy upstream
+    assert llm.stats()["timeouts"] == 0
+    assert llm.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_honours_retry_after_beyond_backoff_max(stub):
+    # The first request gets a 429 asking for 1s, longer than backoff_max
+    stub.fault_fn = lambda request_index: 429 if request_index == 0 else None
+    llm = make_client(stub)
+
+    t0 = time.monotonic()
+    assert llm.complete(PROMPT) == default_reply(PROMPT)
+
+    assert time.monotonic() - t0 >= 1.0
+    assert len(stub.requests) == 2
+    assert llm.stats()["rate_limited"] == 1
+
+
+def test_deadline_caps_backoff(stub):
+    # 429s ask for a 1s Retry-After, longer than the whole call may take
+    stub.fault_fn = random_faults(error_rate=1.0, statuses=(429,))
+    llm = make_client(stub, deadline=0.5)
+
+    t0 = time.monotonic()
+    assert llm.complete(PROMPT) == DEGRADED_RESPONSE
+    elapsed = time.monotonic() - t0
+
+    assert elapsed < 0.5
+    assert len(stub.requests) == 1
+    assert llm.stats()["deadline_exceeded"] == 1
+
+
+def test_deadline_caps_queueing(stub):
+    llm = make_client(stub, requests_per_minute=6, queue_timeout=30.0)
+    llm.request_bucket.acquire(llm.request_bucket.capacity)
+
+    t0 = time.monotonic()
+    assert llm.complete(PROMPT, deadline=0.2) == DEGRADED_RESPONSE
+    assert time.monotonic() - t0 < 0.5
+    assert stub.requests == []
+    assert llm.stats()["queue_timeouts"] == 1
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from stats_cube import build_chat_context, load_cube, parse_question
+
+
+WEAR, TORQUE, SPEED = "Tool_wear_(min)", "Torque_(Nm)", "Rotational_speed_(rpm)"
+
+
+@pytest.mark.parametrize(
+    "question, expected",
+    [
+        ("What's the failure rate for type L with tool wear over 200?",
+         {"Type": "L", WEAR: (200.0, np.inf)}),
+        ("type L with tool wear over 200 and torque below 40",
+         {"Type": "L", WEAR: (200.0, np.inf), TORQUE: (-np.inf, 40.0)}),
+        ("torque is above 60 and speed under 1400",
+         {TORQUE: (60.0, np.inf), SPEED: (-np.inf, 1400.0)}),
+        ("speed under 1400 rpm with torque above 60",
+         {SPEED: (-np.inf, 1400.0), TORQUE: (60.0, np.inf)}),
+        ("M-type machines with torque between 60 and 50 Nm and wear at least 100.5",
+         {"Type": "M", TORQUE: (50.0, 60.0), WEAR: (100.5, np.inf)}),
+        ("tool wear over 100 and under 150", {WEAR: (100.0, 150.0)}),
+    ],
+)
+def test_parse_question_filters(question, expected):
+    filters, _ = parse_question(question)
+    assert filters == expected
+
+
+def test_parse_question_ignores_contradictory_range():
+    filters, _ = parse_question("tool wear over 200 and under 100")
+    assert filters == {}
+
+
+def test_parse_question_failure_modes():
+    _, modes = parse_question("Is overstrain or a power failure more likely at high torque?")
+    assert modes == ["PWF", "OSF"]
+
+
+def test_two_dimension_slice_is_grounded_in_data():
+    cube = load_cube()
+    filters, _ = parse_question("type L with tool wear over 200 and torque below 40")
+    assert cube.query(filters)["count"] > 0
+    context = build_chat_context("type L with tool wear over 200 and torque below 40", cube)
+    assert "no rows" not in context
+    assert "Type L, tool wear >= 200 min, torque < 40 Nm" in context
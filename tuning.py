@@ -0,0 +1,246 @@
+"""
+Fast hyperparameter search for the XGBoost failure model
+
+Random configurations are trained with the `hist` tree method and early
+stopping on a validation fold, and pruned with successive halving (or a full
+Hyperband schedule) across parallel workers. The objective is recall on the
+failure class, with a precision floor so "flag everything" cannot win; class
+imbalance is handled with scale_pos_weight as in the notebook.
+
+    python tuning.py --trials 27 --workers 4 --output xgb_model_tuned.pkl
+"""
+import argparse
+import json
+import math
+import os
+import time
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import f1_score, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier
+
+from scoring import BASE_DIR, MODEL_PATH, load_training_data, notebook_split
+
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "xgb_model_tuned.pkl")
+
+EARLY_STOPPING_ROUNDS = 30
+
+
+def sample_config(rng):
+    """Draw one random configuration from the search space"""
+    return {
+        "max_depth": int(rng.integers(3, 11)),
+        "learning_rate": float(10 ** rng.uniform(-2, -0.5)),
+        "subsample": float(rng.uniform(0.6, 1.0)),
+        "colsample_bytree": float(rng.uniform(0.6, 1.0)),
+        "min_child_weight": float(10 ** rng.uniform(0, 1)),
+        "gamma": float(rng.uniform(0, 5)),
+        "reg_lambda": float(10 ** rng.uniform(-1, 1)),
+    }
+
+
+def score_predictions(y_true, y_pred, min_precision):
+    """
+    Objective: recall on the failure class, subject to a precision floor
+
+    Returns:
+    - Dict of metrics plus "rank_key" (feasible first, then recall, then precision)
+    """
+    recall = recall_score(y_true, y_pred, zero_division=0)
+    precision = precision_score(y_true, y_pred, zero_division=0)
+    return {
+        "recall": float(recall),
+        "precision": float(precision),
+        "f1": float(f1_score(y_true, y_pred, zero_division=0)),
+        "rank_key": (precision >= min_precision, recall, precision),
+    }
+
+
+def build_model(config, n_estimators, scale_pos_weight, n_jobs, random_state=42, early_stopping=True):
+    return XGBClassifier(
+        n_estimators=n_estimators,
+        tree_method="hist",
+        objective="binary:logistic",
+        eval_metric="logloss",
+        scale_pos_weight=scale_pos_weight,
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS if early_stopping else None,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        **config,
+    )
+
+
+def run_trial(config, budget, data, scale_pos_weight, min_precision, n_jobs):
+    """Train one configuration with `budget` trees (early-stopped) and score it"""
+    X_fit, y_fit, X_val, y_val = data
+    t0 = time.perf_counter()
+    model = build_model(config, budget, scale_pos_weight, n_jobs)
+    model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    result = score_predictions(y_val, model.predict(X_val), min_precision)
+    result.update({
+        "config": config,
+        "budget": budget,
+        "best_iteration": int(model.best_iteration),
+        # Early stopping keeps training past best_iteration, so count the rounds actually built
+        "rounds_trained": int(model.get_booster().num_boosted_rounds()),
+        "fit_s": time.perf_counter() - t0,
+    })
+    return result
+
+
+def successive_halving(configs, min_budget, max_budget, eta, run, parallel):
+    """
+    Train all configs on a small budget, keep the best 1/eta, multiply the budget by eta
+
+    Returns:
+    - Tuple of (best trial, list of every trial run)
+    """
+    trials = []
+    budget = min_budget
+    survivors = list(configs)
+    while True:
+        results = parallel(delayed(run)(config, budget) for config in survivors)
+        trials.extend(results)
+        results.sort(key=lambda r: r["rank_key"], reverse=True)
+        if len(results) == 1 or budget >= max_budget:
+            return results[0], trials
+        survivors = [r["config"] for r in results[: max(1, len(results) // eta)]]
+        budget = min(max_budget, budget * eta)
+
+
+def hyperband(rng, min_budget, max_budget, eta, run, parallel):
+    """Run successive-halving brackets from many-cheap to few-expensive configurations"""
+    s_max = int(math.floor(math.log(max_budget / min_budget, eta) + 1e-9))
+    best, trials = None, []
+    for s in range(s_max, -1, -1):
+        n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        configs = [sample_config(rng) for _ in range(n)]
+        bracket_best, bracket_trials = successive_halving(
+            configs, max_budget / eta ** s, max_budget, eta, run, parallel
+        )
+        trials.extend(bracket_trials)
+        if best is None or bracket_best["rank_key"] > best["rank_key"]:
+            best = bracket_best
+    return best, trials
+
+
+def tune(
+    n_trials=27,
+    mode="halving",
+    min_budget=50,
+    max_budget=1350,
+    eta=3,
+    workers=os.cpu_count() or 1,
+    min_precision=0.5,
+    seed=42,
+):
+    """
+    Search hyperparameters and refit the winner on the full training split
+
+    Parameters:
+    - n_trials: Configurations sampled for successive halving
+    - mode: "halving" or "hyperband"
+    - min_budget: Trees per trial on the first rung
+    - max_budget: Trees per trial on the last rung
+    - eta: Halving rate (keep 1/eta of configurations per rung)
+    - workers: Trials trained in parallel
+    - min_precision: Precision floor on the validation fold
+    - seed: Seed for configuration sampling
+
+    Returns:
+    - Tuple of (refit XGBClassifier, report dict)
+    """
+    X, y, _ = load_training_data()
+    X_train, X_test, y_train, y_test = notebook_split(X, y)
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=0.2, stratify=y_train, random_state=seed
+    )
+    data = (X_fit.to_numpy(), y_fit.to_numpy(), X_val.to_numpy(), y_val.to_numpy())
+
+    # Same imbalance handling as the notebook
+    scale_pos_weight = float((y_train == 0).sum() / (y_train == 1).sum())
+    threads_per_trial = max(1, (os.cpu_count() or 1) // max(1, workers))
+
+    def run(config, budget):
+        return run_trial(config, int(round(budget)), data, scale_pos_weight, min_precision, threads_per_trial)
+
+    rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+    with Parallel(n_jobs=workers, prefer="threads") as parallel:
+        if mode == "hyperband":
+            best, trials = hyperband(rng, min_budget, max_budget, eta, run, parallel)
+        else:
+            configs = [sample_config(rng) for _ in range(n_trials)]
+            best, trials = successive_halving(configs, min_budget, max_budget, eta, run, parallel)
+    search_s = time.perf_counter() - t0
+
+    # Refit on the full training split with the early-stopped tree count
+    n_estimators = best["best_iteration"] + 1
+    model = build_model(best["config"], n_estimators, scale_pos_weight, n_jobs=-1, early_stopping=False)
+    model.fit(X_train.to_numpy(), y_train.to_numpy())
+
+    test_metrics = score_predictions(y_test, model.predict(X_test.to_numpy()), min_precision)
+    baseline = joblib.load(MODEL_PATH)
+    baseline_metrics = score_predictions(y_test, baseline.predict(X_test.to_numpy()), min_precision)
+
+    report = {
+        "mode": mode,
+        "search_wall_clock_s": search_s,
+        "trials": len(trials),
+        "trials_per_minute": len(trials) / search_s * 60 if search_s > 0 else None,
+        "trees_trained": int(sum(t["rounds_trained"] for t in trials)),
+        "best_config": best["config"],
+        "n_estimators": n_estimators,
+        "scale_pos_weight": scale_pos_weight,
+        "min_precision": min_precision,
+        "validation": {k: best[k] for k in ("recall", "precision", "f1")},
+        "test": {k: test_metrics[k] for k in ("recall", "precision", "f1")},
+        "baseline_test": {k: baseline_metrics[k] for k in ("recall", "precision", "f1")},
+    }
+    return model, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Successive-halving search for the XGBoost model")
+    parser.add_argument("--mode", choices=["halving", "hyperband"], default="halving")
+    parser.add_argument("--trials", type=int, default=27)
+    parser.add_argument("--min-budget", type=int, default=50)
+    parser.add_argument("--max-budget", type=int, default=1350)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--min-precision", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the tuned model")
+    args = parser.parse_args()
+
+    model, report = tune(
+        n_trials=args.trials,
+        mode=args.mode,
+        min_budget=args.min_budget,
+        max_budget=args.max_budget,
+        eta=args.eta,
+        workers=args.workers,
+        min_precision=args.min_precision,
+        seed=args.seed,
+    )
+
+    joblib.dump(model, args.output)
+    report_path = os.path.splitext(args.output)[0] + ".json"
+    with open(report_path, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+    print(f"Search: {report['trials']} trials in {report['search_wall_clock_s']:.1f}s "
+          f"({report['trials_per_minute']:.1f} trials/min, {report['trees_trained']} trees)")
+    print(f"Best config: {report['best_config']} with {report['n_estimators']} trees")
+    for split in ("validation", "test", "baseline_test"):
+        m = report[split]
+        print(f"  {split:<13} recall={m['recall']:.3f} precision={m['precision']:.3f} f1={m['f1']:.3f}")
+    print(f"Saved model to {args.output} and report to {report_path}")
+
+
+if __name__ == "__main__":
+    main()